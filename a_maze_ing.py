@@ -1,16 +1,25 @@
 """A-Maze-ing: maze generator and terminal visualiser."""
 
-import os
 import sys
-from typing import NoReturn, Tuple, cast
+from typing import List, NoReturn, Optional, Tuple, cast
 
+import profiling
+from batch import run_batch
 from config import read_config
-from maze import Maze
-from generator import MazeGenerator
-from patterns import apply_42_pattern
+from eller import eller_rows
+from prefetch import MazePrefetcher
 from renderer import MazeRenderer
-from solver import shortest_path
-from writer import write_hex_maze
+from writer import BackgroundWriter, write_hex_rows
+
+USAGE = "Usage: python3 a_maze_ing.py [--profile[=TRACE]] <config>"
+DEFAULT_TRACE = "trace.json"
+
+_PAN = {
+    "w": (0, -1),
+    "a": (-1, 0),
+    "s": (0, 1),
+    "d": (1, 0),
+}
 
 
 def _out_of_bounds(
@@ -30,15 +39,80 @@ def _out_of_bounds(
     return x < 0 or x >= w or y < 0 or y >= h
 
 
+def _parse_args(argv: List[str]) -> Tuple[str, Optional[str]]:
+    """Split the command line into the config and trace paths.
+
+    Args:
+        argv: Arguments after the program name.
+
+    Returns:
+        The config file path, and the Chrome trace path if
+        ``--profile`` was given (None otherwise).
+
+    Raises:
+        RuntimeError: If the arguments do not match ``USAGE``.
+    """
+    trace: Optional[str] = None
+    rest: List[str] = []
+    for arg in argv:
+        if arg == "--profile":
+            trace = DEFAULT_TRACE
+        elif arg.startswith("--profile="):
+            trace = arg.split("=", 1)[1] or DEFAULT_TRACE
+        else:
+            rest.append(arg)
+    if len(rest) != 1:
+        raise RuntimeError(USAGE)
+    return rest[0], trace
+
+
+def _report(trace: str) -> None:
+    """Print the profiling summary and write the Chrome trace.
+
+    Args:
+        trace: Trace output file path.
+    """
+    print(profiling.summary())
+    try:
+        profiling.write_trace(trace)
+    except RuntimeError as exc:
+        print(f"Error: {exc}")
+        return
+    print(f"Trace written to {trace}")
+
+
+def _quit(
+    prefetcher: MazePrefetcher, saver: BackgroundWriter
+) -> NoReturn:
+    """Stop the background workers and exit.
+
+    Prefetching is abandoned, but the latest maze is written out
+    before exiting.
+
+    Args:
+        prefetcher: The running maze prefetcher.
+        saver: The running output writer.
+
+    Raises:
+        RuntimeError: If the final write failed.
+    """
+    prefetcher.close()
+    saver.close()
+    error = saver.error()
+    if error:
+        raise RuntimeError(error)
+    sys.exit(0)
+
+
 def main() -> NoReturn:
     """Entry point: parse config, generate and display maze."""
+    trace: Optional[str] = None
     try:
-        if len(sys.argv) != 2:
-            raise RuntimeError(
-                "Usage: python3 a_maze_ing.py <config>"
-            )
+        config_path, trace = _parse_args(sys.argv[1:])
+        if trace is not None:
+            profiling.enable()
 
-        config = read_config(sys.argv[1])
+        config = read_config(config_path)
 
         width = cast(int, config["WIDTH"])
         height = cast(int, config["HEIGHT"])
@@ -65,60 +139,82 @@ def main() -> NoReturn:
                 "ENTRY and EXIT are the same."
             )
 
+        seed = cast(
+            int, config.get("SEED")
+        ) if config.get("SEED") is not None else None
+
+        if config["STREAM"]:
+            with profiling.span("stream"):
+                write_hex_rows(
+                    eller_rows(width, height, seed),
+                    output, entry, exit_pt,
+                )
+            print(f"Maze streamed to {output}")
+            sys.exit(0)
+
+        if config["BATCH"] is not None:
+            first, last = cast(Tuple[int, int], config["BATCH"])
+            with profiling.span("batch"):
+                rate = run_batch(config)
+            print(
+                f"{last - first + 1} mazes written to "
+                f"{config['BATCH_DIR']} ({rate:.1f} mazes/s)"
+            )
+            sys.exit(0)
+
         renderer = MazeRenderer()
         show_path = False
 
+        prefetcher = MazePrefetcher(config, seed)
+        saver = BackgroundWriter(output)
+
         while True:
-            maze = Maze(width, height)
-            if not small:
-                apply_42_pattern(maze, entry, exit_pt)
-
-            seed = cast(
-                int, config.get("SEED")
-            ) if config.get("SEED") is not None else None
-            generator = MazeGenerator(maze, seed)
-            if config["PERFECT"]:
-                generator.generate_perfect(entry)
-            else:
-                generator.generate_imperfect(entry)
-            generator.enforce_borders()
-
-            path = shortest_path(maze, entry, exit_pt)
-
-            write_hex_maze(
-                maze, output, entry, exit_pt, path
-            )
+            with profiling.span("next_maze"):
+                maze, path = prefetcher.take()
+
+            saver.submit(maze, entry, exit_pt, path)
+
+            path_pos = 0
+            renderer.center(entry)
 
             while True:
-                os.system(
-                    "cls" if os.name == "nt"
-                    else "clear"
-                )
-                renderer.render(
-                    maze,
-                    entry,
-                    exit_pt,
-                    path if show_path else None,
-                )
+                with profiling.span("render"):
+                    renderer.repaint(
+                        maze,
+                        entry,
+                        exit_pt,
+                        path if show_path else None,
+                    )
 
                 if small:
                     print(
                         "Maze too small for 42 pattern!"
                     )
 
+                error = saver.error()
+                if error:
+                    print(f"Warning: {error}")
+
                 print("A-Maze-ing")
                 print("1. Re-generate a new maze")
                 print("2. Show/Hide path")
                 print("3. Rotate wall colours")
                 print("4. Quit")
+                cols, rows = renderer.view_size()
+                scrolls = cols < width or rows < height
+                if scrolls:
+                    print(
+                        "w/a/s/d: scroll  e/x: go to entry/exit"
+                        "  n: follow path"
+                    )
 
                 try:
                     choice = input(
                         "Choice? (1-4): "
-                    ).strip()
+                    ).strip().lower()
                 except KeyboardInterrupt:
                     print("\nGoodbye!")
-                    sys.exit(0)
+                    _quit(prefetcher, saver)
 
                 if choice == "1":
                     break
@@ -127,11 +223,26 @@ def main() -> NoReturn:
                 elif choice == "3":
                     renderer.cycle_wall_color()
                 elif choice == "4":
-                    sys.exit(0)
+                    _quit(prefetcher, saver)
+                elif scrolls and choice in _PAN:
+                    dx, dy = _PAN[choice]
+                    renderer.pan(dx * (cols // 2), dy * (rows // 2))
+                elif scrolls and choice == "e":
+                    renderer.center(entry)
+                elif scrolls and choice == "x":
+                    renderer.center(exit_pt)
+                elif scrolls and choice == "n" and path:
+                    path_pos = (path_pos + min(cols, rows) // 2) % len(
+                        path
+                    )
+                    renderer.center(path[path_pos])
 
     except RuntimeError as exc:
         print(f"Error: {exc}")
         sys.exit(1)
+    finally:
+        if trace is not None:
+            _report(trace)
 
 
 if __name__ == "__main__":
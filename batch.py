@@ -0,0 +1,164 @@
+"""Headless batch generation over a process pool."""
+
+import json
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Tuple, Union, cast
+
+import profiling
+from config import ConfigDict
+from generator import MazeGenerator
+from maze import Maze
+from patterns import apply_42_pattern
+from solver import shortest_path
+from writer import write_hex_maze
+
+Point = Tuple[int, int]
+ManifestEntry = Dict[str, Union[int, str]]
+
+
+def build_maze(
+    config: ConfigDict,
+    seed: Optional[int],
+    cancel: Optional[threading.Event] = None,
+) -> Tuple[Maze, List[Point]]:
+    """Generate and solve one maze from the config settings.
+
+    Args:
+        config: Parsed configuration from ``read_config``.
+        seed: RNG seed, or None for a random maze.
+        cancel: Optional event checked between the pattern, generation
+            and solving stages.
+
+    Returns:
+        The finished maze and its shortest path from ENTRY to EXIT.
+
+    Raises:
+        RuntimeError: If *cancel* is set before the maze is finished.
+    """
+    width = cast(int, config["WIDTH"])
+    height = cast(int, config["HEIGHT"])
+    entry = cast(Point, config["ENTRY"])
+    exit_pt = cast(Point, config["EXIT"])
+
+    maze = Maze(width, height)
+    if width >= 9 and height >= 7:
+        with profiling.span("pattern"):
+            apply_42_pattern(maze, entry, exit_pt)
+    _check_cancel(cancel)
+    generator = MazeGenerator(
+        maze, seed, cast(str, config["ALGORITHM"])
+    )
+    with profiling.span("generate"):
+        if config["PERFECT"]:
+            generator.generate_perfect(entry)
+        else:
+            generator.generate_imperfect(entry)
+        generator.enforce_borders()
+    _check_cancel(cancel)
+    with profiling.span("solve"):
+        path = shortest_path(maze, entry, exit_pt)
+    return maze, path
+
+
+def _check_cancel(cancel: Optional[threading.Event]) -> None:
+    """Stop a maze build whose cancel event has been set.
+
+    Args:
+        cancel: The build's cancel event, if any.
+
+    Raises:
+        RuntimeError: If *cancel* is set.
+    """
+    if cancel is not None and cancel.is_set():
+        raise RuntimeError("Maze build cancelled")
+
+
+def _build_one(job: Tuple[ConfigDict, int, str]) -> ManifestEntry:
+    """Build, solve and write the maze for one seed (worker side).
+
+    Args:
+        job: (config, seed, output file path).
+
+    Returns:
+        The manifest entry for the written file.
+    """
+    config, seed, path = job
+    maze, solution = build_maze(config, seed)
+    write_hex_maze(
+        maze,
+        path,
+        cast(Point, config["ENTRY"]),
+        cast(Point, config["EXIT"]),
+        solution,
+    )
+    return {
+        "seed": seed,
+        "file": os.path.basename(path),
+        "path_length": max(len(solution) - 1, 0),
+    }
+
+
+def run_batch(config: ConfigDict) -> float:
+    """Generate one output file per seed of the BATCH range.
+
+    Files are written to BATCH_DIR as ``maze_<seed>.txt`` next to a
+    ``manifest.json``.  Each maze depends only on its seed, so the
+    output is identical whatever the number of workers.
+
+    Args:
+        config: Parsed configuration with BATCH set.
+
+    Returns:
+        Throughput in mazes per second.
+
+    Raises:
+        RuntimeError: If the directory or a file cannot be written.
+    """
+    first, last = cast(Tuple[int, int], config["BATCH"])
+    directory = cast(str, config["BATCH_DIR"])
+    workers = cast(Optional[int], config["WORKERS"])
+    try:
+        os.makedirs(directory, exist_ok=True)
+    except OSError as exc:
+        raise RuntimeError(
+            f"Cannot create batch directory: {exc}"
+        ) from exc
+
+    seeds = range(first, last + 1)
+    jobs = [
+        (config, seed, os.path.join(directory, f"maze_{seed}.txt"))
+        for seed in seeds
+    ]
+    workers = workers or os.cpu_count() or 1
+    chunk = max(1, len(jobs) // (workers * 4))
+
+    started = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        entries = list(pool.map(_build_one, jobs, chunksize=chunk))
+    elapsed = time.perf_counter() - started
+
+    manifest = {
+        "width": config["WIDTH"],
+        "height": config["HEIGHT"],
+        "entry": config["ENTRY"],
+        "exit": config["EXIT"],
+        "perfect": config["PERFECT"],
+        "algorithm": config["ALGORITHM"],
+        "mazes": entries,
+    }
+    try:
+        with open(
+            os.path.join(directory, "manifest.json"),
+            "w",
+            encoding="utf-8",
+        ) as f:
+            json.dump(manifest, f, indent=2)
+            f.write("\n")
+    except OSError as exc:
+        raise RuntimeError(
+            f"Cannot write manifest: {exc}"
+        ) from exc
+    return len(jobs) / elapsed if elapsed > 0 else float(len(jobs))
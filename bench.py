@@ -0,0 +1,468 @@
+"""Benchmark suite: ``python bench.py``, from the repository root.
+
+Times generation, solving, writing and rendering across a ladder of
+maze sizes with fixed seeds and writes the results as JSON::
+
+    python bench.py run -o before.json
+    python bench.py run -o after.json
+    python bench.py compare before.json after.json
+
+``compare`` exits with status 1 when any timing got slower than the
+threshold.  ``memory`` records the peak and retained bytes of each
+stage with tracemalloc instead; with ``--check`` it exits with status
+1 when a stage's peak bytes per cell exceed ``MEMORY_BUDGETS``::
+
+    python bench.py memory --check -o memory.json
+
+The suite lives with the application rather than in ``mazegen``
+because it measures the application's stages too (the 42 pattern,
+the hex writer and the renderer), on the application's own Maze.
+"""
+
+import argparse
+import gc
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+from contextlib import redirect_stdout
+from typing import (
+    Callable, Dict, List, Optional, Sequence, Tuple, TypeVar, cast
+)
+
+from generator import MazeGenerator
+from maze import Maze
+from patterns import apply_42_pattern
+from renderer import MazeRenderer
+from solver import shortest_path
+from writer import write_hex_maze
+
+DEFAULT_SIZES = (10, 50, 100, 500, 1000, 2000)
+DEFAULT_SEEDS = (1, 2, 3)
+DEFAULT_THRESHOLD = 0.10
+# Timings below this are too noisy to flag.
+NOISE_FLOOR = 0.01
+
+MEMORY_SIZES = (100, 500, 1000)
+# Peak bytes allocated per cell by each stage, for Maze (one Cell
+# object per cell).  Fixed costs such as the writer's 1 MB buffer
+# dominate small mazes, so budgets only apply from BUDGET_MIN_SIZE.
+MEMORY_BUDGETS: Dict[str, float] = {
+    "maze_init": 128,
+    "apply_42_pattern": 1,
+    "generate_perfect": 4,
+    "enforce_borders": 1,
+    "shortest_path": 72,
+    "write_hex_maze": 24,
+    "render": 176,
+    "generate_imperfect": 80,
+}
+BUDGET_MIN_SIZE = 500
+
+Results = Dict[str, float]
+# (peak, retained) bytes.
+Footprint = Tuple[int, int]
+T = TypeVar("T")
+
+
+def _timed(func: Callable[[], object]) -> float:
+    """Run *func* once and return the elapsed seconds.
+
+    Args:
+        func: Callable to time.
+
+    Returns:
+        Wall-clock seconds.
+    """
+    start = time.perf_counter()
+    func()
+    return time.perf_counter() - start
+
+
+def _traced(func: Callable[[], object]) -> Footprint:
+    """Run *func* once under tracemalloc.
+
+    Args:
+        func: Callable to measure; tracemalloc must be tracing.
+
+    Returns:
+        (peak, retained) bytes allocated by the call: the highest
+        usage above the starting point while it ran, and what was
+        still allocated when it returned.
+    """
+    gc.collect()
+    before = tracemalloc.get_traced_memory()[0]
+    tracemalloc.reset_peak()
+    func()
+    current, peak = tracemalloc.get_traced_memory()
+    return peak - before, current - before
+
+
+def bench_case(
+    size: int,
+    seed: int,
+    tmpdir: str,
+    measure: Callable[[Callable[[], object]], T],
+) -> Dict[str, T]:
+    """Measure every stage once for one size and seed.
+
+    Args:
+        size: Maze width and height.
+        seed: Generator seed.
+        tmpdir: Directory for the written maze file.
+        measure: ``_timed`` or ``_traced``.
+
+    Returns:
+        Operation name -> measurement.
+    """
+    entry, exit_pt = (0, 0), (size - 1, size - 1)
+    out: Dict[str, T] = {}
+
+    mazes: List[Maze] = []
+    out["maze_init"] = measure(lambda: mazes.append(Maze(size, size)))
+    maze = mazes[0]
+    if size >= 9:
+        out["apply_42_pattern"] = measure(
+            lambda: apply_42_pattern(maze, entry, exit_pt)
+        )
+    generator = MazeGenerator(maze, seed)
+    out["generate_perfect"] = measure(
+        lambda: generator.generate_perfect(entry)
+    )
+    out["enforce_borders"] = measure(generator.enforce_borders)
+
+    path: List[Tuple[int, int]] = []
+    out["shortest_path"] = measure(
+        lambda: path.extend(shortest_path(maze, entry, exit_pt))
+    )
+    target = os.path.join(tmpdir, "maze.txt")
+    out["write_hex_maze"] = measure(
+        lambda: write_hex_maze(maze, target, entry, exit_pt, path)
+    )
+    view = MazeRenderer()
+    with open(os.devnull, "w", encoding="utf-8") as null:
+        with redirect_stdout(null):
+            out["render"] = measure(
+                lambda: view.render(maze, entry, exit_pt, path)
+            )
+
+    imperfect = Maze(size, size)
+    out["generate_imperfect"] = measure(
+        lambda: MazeGenerator(imperfect, seed).generate_imperfect(entry)
+    )
+    return out
+
+
+def run(
+    sizes: Sequence[int] = DEFAULT_SIZES,
+    seeds: Sequence[int] = DEFAULT_SEEDS,
+    repeat: int = 1,
+    log: Callable[[str], None] = print,
+) -> Dict[str, object]:
+    """Run the whole suite.
+
+    Each timing is the best of *repeat* runs.
+
+    Args:
+        sizes: Maze sizes (width = height) to time.
+        seeds: Generator seeds; each size runs once per seed.
+        repeat: Runs per case, keeping the fastest.
+        log: Progress callback.
+
+    Returns:
+        A JSON-serialisable dict with ``meta`` and ``results``; result
+        keys are ``"<operation>/<size>x<size>/seed<seed>"``.
+    """
+    results: Results = {}
+    with tempfile.TemporaryDirectory() as tmpdir:
+        for size in sizes:
+            for seed in seeds:
+                best: Results = {}
+                for _ in range(repeat):
+                    case = bench_case(size, seed, tmpdir, _timed)
+                    for op, seconds in case.items():
+                        best[op] = min(seconds, best.get(op, seconds))
+                for op, seconds in best.items():
+                    results[f"{op}/{size}x{size}/seed{seed}"] = seconds
+                log(f"{size}x{size} seed {seed}: " + ", ".join(
+                    f"{op} {seconds:.4f}s" for op, seconds in best.items()
+                ))
+    return {
+        "meta": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "sizes": list(sizes),
+            "seeds": list(seeds),
+            "repeat": repeat,
+        },
+        "results": results,
+    }
+
+
+def memory(
+    sizes: Sequence[int] = MEMORY_SIZES,
+    seeds: Sequence[int] = DEFAULT_SEEDS,
+    log: Callable[[str], None] = print,
+) -> Dict[str, object]:
+    """Record the memory allocated by each stage with tracemalloc.
+
+    Args:
+        sizes: Maze sizes (width = height) to measure.
+        seeds: Generator seeds; each size runs once per seed.
+        log: Progress callback.
+
+    Returns:
+        A JSON-serialisable dict with ``meta`` and ``results``; each
+        result maps ``peak_bytes``, ``retained_bytes`` and the same
+        divided by the number of cells (``peak_per_cell``,
+        ``retained_per_cell``).
+    """
+    results: Dict[str, Dict[str, float]] = {}
+    tracing = tracemalloc.is_tracing()
+    if not tracing:
+        tracemalloc.start()
+    try:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            for size in sizes:
+                cells = size * size
+                for seed in seeds:
+                    case = bench_case(size, seed, tmpdir, _traced)
+                    for op, (peak, retained) in case.items():
+                        results[f"{op}/{size}x{size}/seed{seed}"] = {
+                            "peak_bytes": peak,
+                            "retained_bytes": retained,
+                            "peak_per_cell": peak / cells,
+                            "retained_per_cell": retained / cells,
+                        }
+                    log(f"{size}x{size} seed {seed}: " + ", ".join(
+                        f"{op} {peak / cells:.1f}/{retained / cells:.1f}"
+                        for op, (peak, retained) in case.items()
+                    ) + " B/cell (peak/retained)")
+    finally:
+        if not tracing:
+            tracemalloc.stop()
+    return {
+        "meta": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "sizes": list(sizes),
+            "seeds": list(seeds),
+        },
+        "results": results,
+    }
+
+
+def over_budget(
+    results: Dict[str, Dict[str, float]],
+    budgets: Dict[str, float],
+    min_size: int = BUDGET_MIN_SIZE,
+) -> List[str]:
+    """List the stages whose peak bytes per cell exceed their budget.
+
+    A budgeted stage that has no result for a measured size and seed
+    is reported too, so a stage that stops running cannot pass the
+    check by going missing.
+
+    Args:
+        results: The ``results`` of a ``memory`` run.
+        budgets: Operation name -> allowed peak bytes per cell;
+            operations without a budget are not checked.
+        min_size: Smallest maze size the budgets apply to.
+
+    Returns:
+        One human-readable line per stage over budget or missing.
+    """
+    failures = []
+    cases = set()
+    for key, footprint in sorted(results.items()):
+        op, dims, seed = key.split("/")
+        if int(dims.split("x")[0]) < min_size:
+            continue
+        cases.add(f"{dims}/{seed}")
+        budget = budgets.get(op)
+        if budget is not None and footprint["peak_per_cell"] > budget:
+            failures.append(
+                f"{key}: {footprint['peak_per_cell']:.1f} B/cell "
+                f"over budget of {budget:g}"
+            )
+    for case in sorted(cases):
+        for op in sorted(budgets):
+            if f"{op}/{case}" not in results:
+                failures.append(f"{op}/{case}: not measured")
+    return failures
+
+
+def compare(
+    base: Results, new: Results, threshold: float = DEFAULT_THRESHOLD
+) -> List[str]:
+    """List the timings that got slower by more than *threshold*.
+
+    Timings under ``NOISE_FLOOR`` in both files are ignored.
+
+    Args:
+        base: Results of the reference run.
+        new: Results of the run to check.
+        threshold: Allowed relative slowdown (0.10 = 10 %).
+
+    Returns:
+        One human-readable line per regression.
+    """
+    regressions = []
+    for key in sorted(base.keys() & new.keys()):
+        old, cur = base[key], new[key]
+        if max(old, cur) < NOISE_FLOOR or old <= 0:
+            continue
+        change = cur / old - 1
+        if change > threshold:
+            regressions.append(
+                f"{key}: {old:.4f}s -> {cur:.4f}s (+{change:.0%})"
+            )
+    return regressions
+
+
+def _load(path: str) -> Results:
+    """Read the results of a saved run.
+
+    Args:
+        path: JSON file written by ``run``.
+
+    Returns:
+        Operation key -> seconds.
+
+    Raises:
+        RuntimeError: If the file cannot be read or parsed, or does
+            not hold timings (e.g. a ``memory`` report).
+    """
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            results = json.load(f)["results"]
+    except (OSError, ValueError, KeyError, TypeError) as exc:
+        raise RuntimeError(f"Cannot read results {path}: {exc}") from exc
+    if not isinstance(results, dict) or not all(
+        isinstance(v, (int, float)) and not isinstance(v, bool)
+        for v in results.values()
+    ):
+        raise RuntimeError(f"{path} does not hold timings from 'run'")
+    return results
+
+
+def _ints(value: str) -> List[int]:
+    """Parse a comma-separated list of integers (argparse type)."""
+    return [int(v) for v in value.split(",") if v]
+
+
+def _budget(value: str) -> Tuple[str, float]:
+    """Parse an ``OPERATION=BYTES`` budget (argparse type)."""
+    op, sep, limit = value.partition("=")
+    if not sep:
+        raise argparse.ArgumentTypeError(
+            f"expected OPERATION=BYTES, got {value!r}"
+        )
+    return op, float(limit)
+
+
+def _emit(report: Dict[str, object], output: Optional[str]) -> None:
+    """Write a report as JSON to *output*, or to stdout.
+
+    Args:
+        report: Result of ``run`` or ``memory``.
+        output: Output file path, or None for stdout.
+    """
+    text = json.dumps(report, indent=2) + "\n"
+    if output:
+        with open(output, "w", encoding="utf-8") as f:
+            f.write(text)
+    else:
+        sys.stdout.write(text)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    """Command-line entry point.
+
+    Args:
+        argv: Arguments, ``sys.argv[1:]`` by default.
+
+    Returns:
+        Process exit status.
+    """
+    parser = argparse.ArgumentParser(
+        prog="python bench.py",
+        description="Time maze generation, solving, writing and rendering.",
+    )
+    sub = parser.add_subparsers(dest="command", required=True)
+    run_cmd = sub.add_parser("run", help="time the suite")
+    run_cmd.add_argument("--sizes", type=_ints, default=DEFAULT_SIZES)
+    run_cmd.add_argument("--seeds", type=_ints, default=DEFAULT_SEEDS)
+    run_cmd.add_argument("--repeat", type=int, default=1)
+    run_cmd.add_argument("-o", "--output", help="JSON file (default stdout)")
+    mem_cmd = sub.add_parser("memory", help="trace allocations")
+    mem_cmd.add_argument("--sizes", type=_ints, default=MEMORY_SIZES)
+    mem_cmd.add_argument("--seeds", type=_ints, default=DEFAULT_SEEDS)
+    mem_cmd.add_argument("-o", "--output", help="JSON file (default stdout)")
+    mem_cmd.add_argument(
+        "--check",
+        action="store_true",
+        help="exit 1 if a stage exceeds its bytes-per-cell budget",
+    )
+    mem_cmd.add_argument(
+        "--budget",
+        type=_budget,
+        action="append",
+        default=[],
+        metavar="OP=BYTES",
+        help="override the peak bytes-per-cell budget of one stage",
+    )
+    cmp_cmd = sub.add_parser("compare", help="flag regressions")
+    cmp_cmd.add_argument("base")
+    cmp_cmd.add_argument("new")
+    cmp_cmd.add_argument(
+        "--threshold", type=float, default=DEFAULT_THRESHOLD
+    )
+    args = parser.parse_args(argv)
+
+    try:
+        if args.command == "compare":
+            regressions = compare(
+                _load(args.base), _load(args.new), args.threshold
+            )
+            for line in regressions:
+                print(line)
+            print(
+                f"{len(regressions)} regression(s) over "
+                f"{args.threshold:.0%}"
+            )
+            return 1 if regressions else 0
+
+        def log(msg: str) -> None:
+            print(msg, file=sys.stderr)
+
+        if args.command == "memory":
+            report = memory(args.sizes, args.seeds, log)
+            _emit(report, args.output)
+            if not args.check:
+                return 0
+            failures = over_budget(
+                cast(Dict[str, Dict[str, float]], report["results"]),
+                {**MEMORY_BUDGETS, **dict(args.budget)},
+            )
+            for line in failures:
+                print(line, file=sys.stderr)
+            print(
+                f"{len(failures)} stage(s) over budget", file=sys.stderr
+            )
+            return 1 if failures else 0
+
+        _emit(run(args.sizes, args.seeds, args.repeat, log), args.output)
+        return 0
+    except (RuntimeError, OSError) as exc:
+        print(f"Error: {exc}", file=sys.stderr)
+        return 2
+
+
+if __name__ == "__main__":
+    sys.exit(main())
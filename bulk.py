@@ -0,0 +1,446 @@
+"""Row-vectorized Binary Tree and Sidewinder generators.
+
+Both algorithms carve whole rows with array operations instead of
+visiting cells one by one.  With NumPy installed the entire grid is
+processed at once; without it rows are handled as big integers
+holding one byte lane per cell.  The RNG is drawn as a single
+``randbytes`` block, so both paths carve the same maze for a seed.
+
+Cells are packed as in CompactMaze (walls in bits 0-3, visited in bit
+4, marked in bit 5).  Marked cells are never carved; cells cut off by
+them are joined back to the maze, so the result stays a single tree.
+"""
+
+import random
+from typing import Dict, List, Tuple
+
+from cell import TOP, RIGHT, BOTTOM, LEFT
+from maze import MARKED, VISITED, CompactMaze, Maze
+
+try:
+    import numpy as np
+    HAVE_NUMPY = True
+except ImportError:
+    HAVE_NUMPY = False
+
+#: Cells per big-integer block in the pure-Python Sidewinder.
+_BLOCK_CELLS = 1 << 16
+
+
+def binary_tree(maze: Maze, rng: random.Random) -> None:
+    """Carve a Binary Tree maze (every cell links north or east).
+
+    Args:
+        maze: The maze to carve; marked cells are left closed.
+        rng: Random source.
+    """
+    _run(maze, rng, sidewinder=False)
+
+
+def sidewinder(maze: Maze, rng: random.Random) -> None:
+    """Carve a Sidewinder maze (east runs, one north link per run).
+
+    Args:
+        maze: The maze to carve; marked cells are left closed.
+        rng: Random source.
+    """
+    _run(maze, rng, sidewinder=True)
+
+
+def _run(maze: Maze, rng: random.Random, sidewinder: bool) -> None:
+    """Pack the maze, carve it and write the result back.
+
+    Args:
+        maze: The maze to carve.
+        rng: Random source.
+        sidewinder: Use Sidewinder instead of Binary Tree.
+    """
+    width, height = maze.width, maze.height
+    if not width or not height:
+        return
+    compact = isinstance(maze, CompactMaze)
+    data = maze.data if isinstance(maze, CompactMaze) else _pack(maze)
+    rand = rng.randbytes(width * height)
+
+    if HAVE_NUMPY:
+        orphans = _carve_numpy(data, width, height, rand, sidewinder)
+    else:
+        orphans = _carve_rows(data, width, height, rand, sidewinder)
+    _attach_orphans(data, width, height, orphans)
+
+    if not compact:
+        _unpack(data, maze)
+    maze.revision += 1
+
+
+def _pack(maze: Maze) -> bytearray:
+    """Pack the cells of any Maze into a CompactMaze-style buffer.
+
+    Args:
+        maze: The maze to read.
+
+    Returns:
+        One byte per cell, row-major.
+    """
+    return bytearray(
+        cell.walls
+        | (VISITED if cell.visited else 0)
+        | (MARKED if cell.marked else 0)
+        for row in maze.grid
+        for cell in row
+    )
+
+
+def _unpack(data: bytearray, maze: Maze) -> None:
+    """Copy a packed buffer back into the cells of *maze*.
+
+    Args:
+        data: One byte per cell, row-major.
+        maze: The maze to update.
+    """
+    width = maze.width
+    for y, row in enumerate(maze.grid):
+        for x, cell in enumerate(row):
+            value = data[y * width + x]
+            cell.walls = value & 0xF
+            cell.visited = bool(value & VISITED)
+            cell.marked = bool(value & MARKED)
+
+
+def _carve_numpy(
+    data: bytearray,
+    width: int,
+    height: int,
+    rand: bytes,
+    sidewinder: bool,
+) -> List[int]:
+    """Carve the whole grid with NumPy.
+
+    Args:
+        data: Packed cells, updated in place.
+        width: Number of columns.
+        height: Number of rows.
+        rand: One random byte per cell.
+        sidewinder: Use Sidewinder instead of Binary Tree.
+
+    Returns:
+        Flat indices of the tree roots, in row-major order.
+    """
+    a = np.frombuffer(data, dtype=np.uint8).reshape(height, width)
+    r = np.frombuffer(rand, dtype=np.uint8).reshape(height, width)
+    free = (a & MARKED) == 0
+    can_east = np.zeros_like(free)
+    can_east[:, :-1] = free[:, :-1] & free[:, 1:]
+    can_north = np.zeros_like(free)
+    can_north[1:, :] = free[1:, :] & free[:-1, :]
+    coin = (r & 1) == 1
+
+    if sidewinder:
+        east = can_east & coin
+        east[0] = can_east[0]
+        starts = np.ones(height * width, dtype=bool)
+        starts[1:] = ~east.reshape(-1)[:-1]
+        first = np.flatnonzero(starts)
+        key = np.where(
+            can_north,
+            (128 + (r >> 1)).astype(np.int64) * width
+            + np.arange(width),
+            -1,
+        ).reshape(-1)
+        best = np.maximum.reduceat(key, first)
+        won = best >= 0
+        linked = np.zeros(height * width, dtype=bool)
+        linked[(first[won] // width) * width + best[won] % width] = True
+        north = linked.reshape(height, width)
+        roots = first[~won & free.reshape(-1)[first]]
+    else:
+        east = can_east & (coin | ~can_north)
+        north = can_north & ~east
+        roots = np.flatnonzero(free & ~east & ~north)
+
+    walls = np.full((height, width), 0xF, dtype=np.uint8)
+    walls -= east.astype(np.uint8) * RIGHT
+    walls[:, 1:] -= east[:, :-1].astype(np.uint8) * LEFT
+    walls -= north.astype(np.uint8) * TOP
+    walls[:-1, :] -= north[1:, :].astype(np.uint8) * BOTTOM
+    a[:] = (a & 0xF0) | walls | free.astype(np.uint8) * VISITED
+    result: List[int] = roots.tolist()
+    return result
+
+
+def _carve_rows(
+    data: bytearray,
+    width: int,
+    height: int,
+    rand: bytes,
+    sidewinder: bool,
+) -> List[int]:
+    """Carve row by row using big-integer byte lanes.
+
+    Each row is read as one little-endian integer with a byte per
+    cell, so masks for the whole row are built with a few integer
+    operations.  Sidewinder is handed to :func:`_sidewinder_blocks`.
+
+    Args:
+        data: Packed cells, updated in place.
+        width: Number of columns.
+        height: Number of rows.
+        rand: One random byte per cell.
+        sidewinder: Use Sidewinder instead of Binary Tree.
+
+    Returns:
+        Flat indices of the tree roots, in row-major order.
+    """
+    if sidewinder:
+        return _sidewinder_blocks(data, width, height, rand)
+    ones = int.from_bytes(b"\x01" * width, "little")
+    last = 1 << (8 * (width - 1))
+    roots: List[int] = []
+    prev_free = 0
+    prev_walls = 0
+    prev_high = 0
+
+    for y in range(height):
+        start = y * width
+        row = int.from_bytes(data[start:start + width], "little")
+        bits = int.from_bytes(rand[start:start + width], "little")
+        free = ~(row >> 5) & ones
+        can_east = free & (free >> 8) & ~last
+        can_north = free & prev_free
+        coin = bits & ones
+
+        east = can_east & (coin | (ones & ~can_north))
+        north = can_north & ~east
+        _collect(roots, free & ~east & ~north, width, start)
+
+        walls = (
+            ones * 0xF
+            - east * RIGHT
+            - (east << 8) * LEFT
+            - north * TOP
+        )
+        if y:
+            prev_walls -= north * BOTTOM
+            data[start - width:start] = (
+                prev_high | prev_walls
+            ).to_bytes(width, "little")
+        prev_free = free
+        prev_walls = walls
+        prev_high = (row & (ones * 0xF0)) | free * VISITED
+
+    data[(height - 1) * width:] = (
+        prev_high | prev_walls
+    ).to_bytes(width, "little")
+    return roots
+
+
+def _sidewinder_blocks(
+    data: bytearray, width: int, height: int, rand: bytes
+) -> List[int]:
+    """Carve Sidewinder a block of rows at a time using byte lanes.
+
+    Each cell that may link north gets the key ``128 + (r >> 1)``; the
+    run's north link goes to its highest key, rightmost on ties, as in
+    the NumPy path.  Per-run maxima come from segmented scans that
+    double their stride each step, so a block needs about log2 of its
+    longest run in big-integer operations rather than a Python loop
+    per run.
+
+    Args:
+        data: Packed cells, updated in place.
+        width: Number of columns.
+        height: Number of rows.
+        rand: One random byte per cell.
+
+    Returns:
+        Flat indices of the tree roots, in row-major order.
+    """
+    rows = max(1, _BLOCK_CELLS // width)
+    row_bits = 8 * width
+    first_row = int.from_bytes(b"\x01" * width, "little")
+    roots: List[int] = []
+    prev_free = 0
+
+    for y in range(0, height, rows):
+        start, stop = y * width, min(y + rows, height) * width
+        size = stop - start
+        ones = int.from_bytes(b"\x01" * size, "little")
+        high, low = ones * 0x80, ones * 0x7F
+        inner = int.from_bytes(
+            (b"\x01" * (width - 1) + b"\x00") * (size // width), "little"
+        )
+        block = int.from_bytes(data[start:stop], "little")
+        bits = int.from_bytes(rand[start:stop], "little")
+        free = ~(block >> 5) & ones
+        can_east = free & (free >> 8) & inner
+        can_north = free & ((free << row_bits) | prev_free) & ones
+        east = can_east & bits
+        if not y:
+            east |= can_east & first_row
+
+        # Lane i of ``joined`` is set when cell i - 1 is in the same run.
+        joined = east << 8
+        keys = (((bits >> 1) & low) | high) & (can_north * 0xFF)
+        left = _run_max(keys, joined, 8, high, low)
+        right = _run_max(keys, east, -8, high, low)
+        before = (left << 8) & (joined * 0xFF)
+        after = (right >> 8) & (east * 0xFF)
+        won = keys & _lanes_ge(keys, before, high, low)
+        won &= ~_lanes_ge(after, keys, high, low)
+        north = (won & high) >> 7
+        empty = ~((((right & low) + low) | right) & high) >> 7
+        _collect(roots, free & ~joined & empty, size, start)
+
+        walls = (
+            ones * 0xF
+            - east * RIGHT
+            - joined * LEFT
+            - north * TOP
+            - (north >> row_bits) * BOTTOM
+        )
+        data[start:stop] = (
+            (block & (ones * 0xF0)) | free * VISITED | walls
+        ).to_bytes(size, "little")
+        up = north & first_row
+        if up:
+            above = int.from_bytes(data[start - width:start], "little")
+            data[start - width:start] = (
+                above - up * BOTTOM
+            ).to_bytes(width, "little")
+        prev_free = free >> (8 * (size - width))
+    return roots
+
+
+def _run_max(keys: int, link: int, shift: int, high: int, low: int) -> int:
+    """Take the running maximum of byte lanes within each run.
+
+    Args:
+        keys: One unsigned byte per cell.
+        link: 0x01 in each lane whose neighbour ``shift`` bits away
+            belongs to the same run.
+        shift: 8 to scan left to right, -8 to scan right to left.
+        high: 0x80 in every lane.
+        low: 0x7F in every lane.
+
+    Returns:
+        For every cell, the largest key between it and the run's start
+        (``shift`` > 0) or end (``shift`` < 0).
+    """
+    best = keys
+    while link:
+        if shift > 0:
+            moved = (best << shift) & (link * 0xFF)
+            link &= link << shift
+        else:
+            moved = (best >> -shift) & (link * 0xFF)
+            link &= link >> -shift
+        more = (_lanes_ge(moved, best, high, low) >> 7) * 0xFF
+        best = (moved & more) | (best & ~more)
+        shift *= 2
+    return best
+
+
+def _lanes_ge(a: int, b: int, high: int, low: int) -> int:
+    """Compare two integers as unsigned byte lanes.
+
+    Args:
+        a: Left operand.
+        b: Right operand.
+        high: 0x80 in every lane.
+        low: 0x7F in every lane.
+
+    Returns:
+        0x80 in each lane where ``a >= b``, zero elsewhere.
+    """
+    diff = ((a | high) - (b & low)) & high
+    top_a, top_b = a & high, b & high
+    return ((top_a & ~top_b) | (~(top_a ^ top_b) & diff)) & high
+
+
+def _collect(roots: List[int], mask: int, size: int, start: int) -> None:
+    """Append the set lanes of a byte-lane mask as flat indices.
+
+    Args:
+        roots: List to extend.
+        mask: 0x01 in each selected lane.
+        size: Number of lanes in *mask*.
+        start: Flat index of lane 0.
+    """
+    lanes = mask.to_bytes(size, "little")
+    x = lanes.find(1)
+    while x >= 0:
+        roots.append(start + x)
+        x = lanes.find(1, x + 1)
+
+
+def _attach_orphans(
+    data: bytearray, width: int, height: int, roots: List[int]
+) -> None:
+    """Join every tree but the first to the rest of the maze.
+
+    One pass floods each orphan tree through open walls, labelling its
+    cells and noting closed walls to unmarked neighbours; cells left
+    unlabelled belong to the main tree.  Each orphan's group, kept in a
+    union-find, then opens exits to other groups until it holds the
+    main tree or has no exit left.  Joining two distinct trees never
+    creates a loop.
+
+    Args:
+        data: Packed cells, updated in place.
+        width: Number of columns.
+        height: Number of rows.
+        roots: Flat indices of the tree roots, main tree first.
+    """
+    if len(roots) < 2:
+        return
+    bottom_row = (height - 1) * width
+    tree: Dict[int, int] = {}
+    exits: List[List[Tuple[int, int, int, int]]] = [[]]
+    for label, root in enumerate(roots[1:], 1):
+        tree[root] = label
+        found: List[Tuple[int, int, int, int]] = []
+        stack = [root]
+        while stack:
+            i = stack.pop()
+            cell = data[i]
+            x = i % width
+            for inside, j, wall, opposite in (
+                (i >= width, i - width, TOP, BOTTOM),
+                (x < width - 1, i + 1, RIGHT, LEFT),
+                (i < bottom_row, i + width, BOTTOM, TOP),
+                (x > 0, i - 1, LEFT, RIGHT),
+            ):
+                if not inside:
+                    continue
+                if cell & wall:
+                    if not data[j] & MARKED:
+                        found.append((i, j, wall, opposite))
+                elif j not in tree:
+                    tree[j] = label
+                    stack.append(j)
+        exits.append(found)
+
+    parent = list(range(len(roots)))
+
+    def find(label: int) -> int:
+        while parent[label] != label:
+            parent[label] = parent[parent[label]]
+            label = parent[label]
+        return label
+
+    for label in range(1, len(roots)):
+        group = find(label)
+        pending = exits[group]
+        while pending and group != find(0):
+            i, j, wall, opposite = pending.pop()
+            other = find(tree.get(j, 0))
+            if other == group:
+                continue
+            data[i] &= ~wall
+            data[j] &= ~opposite
+            if len(exits[other]) > len(pending):
+                exits[other], pending = pending, exits[other]
+            pending.extend(exits[other])
+            exits[other] = []
+            parent[other] = group
+        exits[group] = pending
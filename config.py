@@ -2,6 +2,8 @@
 
 from typing import Dict, Optional, Tuple, Union
 
+from generator import MazeGenerator
+
 ConfigDict = Dict[
     str, Union[int, str, bool, Tuple[int, int], None]
 ]
@@ -123,6 +125,13 @@ def _convert_config(
     else:
         raise RuntimeError("PERFECT must be True or False")
 
+    stream: bool = False
+    if "STREAM" in raw:
+        value = raw["STREAM"].lower()
+        if value not in ("true", "false"):
+            raise RuntimeError("STREAM must be True or False")
+        stream = value == "true"
+
     seed: Optional[int] = None
     if "SEED" in raw and raw["SEED"]:
         try:
@@ -132,6 +141,44 @@ def _convert_config(
                 "SEED must be an integer"
             ) from exc
 
+    batch: Optional[Tuple[int, int]] = None
+    if "BATCH" in raw:
+        batch = _parse_batch(raw["BATCH"], seed)
+
+    workers: Optional[int] = None
+    if "WORKERS" in raw:
+        try:
+            workers = int(raw["WORKERS"])
+        except ValueError as exc:
+            raise RuntimeError("WORKERS must be an integer") from exc
+        if workers < 1:
+            raise RuntimeError("WORKERS must be at least 1")
+
+    algorithm: str = raw.get("ALGORITHM", "backtracker").lower()
+    if algorithm not in MazeGenerator.ALGORITHMS:
+        raise RuntimeError(
+            "ALGORITHM must be one of: "
+            + ", ".join(sorted(MazeGenerator.ALGORITHMS))
+        )
+
+    if stream and not perfect:
+        raise RuntimeError(
+            "STREAM=True always generates a perfect maze; "
+            "set PERFECT=True"
+        )
+    if stream and "ALGORITHM" in raw:
+        raise RuntimeError(
+            "STREAM=True always uses Eller's algorithm; remove ALGORITHM"
+        )
+    batch_keys = [
+        key for key in ("BATCH", "BATCH_DIR", "WORKERS") if key in raw
+    ]
+    if stream and batch_keys:
+        raise RuntimeError(
+            "STREAM=True writes a single maze to OUTPUT_FILE; remove "
+            + ", ".join(batch_keys)
+        )
+
     return {
         "WIDTH": width,
         "HEIGHT": height,
@@ -140,9 +187,48 @@ def _convert_config(
         "OUTPUT_FILE": output_file,
         "PERFECT": perfect,
         "SEED": seed,
+        "ALGORITHM": algorithm,
+        "STREAM": stream,
+        "BATCH": batch,
+        "BATCH_DIR": raw.get("BATCH_DIR", "mazes"),
+        "WORKERS": workers,
     }
 
 
+def _parse_batch(
+    value: str, seed: Optional[int]
+) -> Tuple[int, int]:
+    """Parse a BATCH value into an inclusive seed range.
+
+    ``N`` means N seeds starting at SEED (or 0); ``first,last`` is an
+    explicit inclusive range.
+
+    Args:
+        value: The raw string value.
+        seed: The parsed SEED, if any.
+
+    Returns:
+        A tuple of (first, last) seeds.
+
+    Raises:
+        RuntimeError: If the format is invalid or the range is empty.
+    """
+    try:
+        if "," in value:
+            first_str, last_str = value.split(",")
+            first, last = int(first_str), int(last_str)
+        else:
+            first = seed if seed is not None else 0
+            last = first + int(value) - 1
+    except ValueError as exc:
+        raise RuntimeError(
+            "BATCH must be a count or first,last"
+        ) from exc
+    if last < first:
+        raise RuntimeError("BATCH must contain at least one seed")
+    return first, last
+
+
 def _parse_coordinates(
     value: str, name: str
 ) -> Tuple[int, int]:
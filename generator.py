@@ -1,8 +1,14 @@
-"""Maze generator using recursive backtracker (DFS)."""
+"""Maze generator with pluggable carving algorithms."""
 
 import random
-from typing import List, Optional, Tuple
+from array import array
+from itertools import permutations
+from typing import (
+    Callable, ClassVar, Dict, List, Optional, Tuple
+)
 
+from bulk import binary_tree, sidewinder
+import profiling
 from maze import Maze
 from cell import TOP, RIGHT, BOTTOM, LEFT
 
@@ -15,31 +21,71 @@ DIRECTIONS: List[Direction] = [
     (-1, 0, LEFT, RIGHT),
 ]
 
+# Every ordering of DIRECTIONS, and the index of each index ordering.
+_ORDERS: List[Tuple[int, ...]] = list(permutations(range(4)))
+_ORDER_ID = {order: i for i, order in enumerate(_ORDERS)}
+_SHUFFLED: List[Tuple[Direction, ...]] = [
+    tuple(DIRECTIONS[k] for k in order) for order in _ORDERS
+]
+
+Algorithm = Callable[["MazeGenerator", int, int], None]
+
 
 class MazeGenerator:
-    """Generate a perfect maze via recursive backtracking."""
+    """Generate a perfect maze with a selectable algorithm.
+
+    ``ALGORITHMS`` maps algorithm names to carving functions taking
+    the generator and the start coordinates; extra algorithms can be
+    added with ``register_algorithm``.
+    """
 
     def __init__(
-        self, maze: Maze, seed: Optional[int] = None
+        self,
+        maze: Maze,
+        seed: Optional[int] = None,
+        algorithm: str = "backtracker",
     ) -> None:
         """Initialise the generator.
 
         Args:
             maze: The Maze instance to carve.
             seed: Optional RNG seed for reproducibility.
+            algorithm: Name of a registered algorithm.
+
+        Raises:
+            ValueError: If *algorithm* is not registered.
         """
+        if algorithm not in self.ALGORITHMS:
+            raise ValueError(
+                f"Unknown algorithm {algorithm!r}; choose from "
+                + ", ".join(sorted(self.ALGORITHMS))
+            )
         self.maze = maze
         self.rng = random.Random(seed)
+        self.algorithm = algorithm
+
+    @classmethod
+    def register_algorithm(cls, name: str, func: Algorithm) -> None:
+        """Make *func* available as ``algorithm=name``.
+
+        Args:
+            name: Algorithm name used in config files.
+            func: Callable carving a perfect maze from (x, y).
+        """
+        cls.ALGORITHMS[name] = func
 
     def generate_perfect(
         self, start: Tuple[int, int]
     ) -> None:
         """Generate a perfect maze from *start*.
 
+        Cells already visited (such as the 42 pattern) are left
+        untouched by every algorithm.
+
         Args:
             start: (x, y) coordinates to begin from.
         """
-        self._dfs(start[0], start[1])
+        self.ALGORITHMS[self.algorithm](self, start[0], start[1])
 
     def generate_imperfect(
         self, start: Tuple[int, int]
@@ -47,136 +93,527 @@ class MazeGenerator:
         """Generate an imperfect maze with loops.
 
         Builds a perfect maze first, then removes random
-        internal walls to create multiple paths.
+        internal walls to create multiple paths, skipping any
+        removal that would open a 3x3 area.
 
         Args:
             start: (x, y) coordinates to begin from.
         """
         self.generate_perfect(start)
 
-        walls: List[Tuple[int, int, int, int]] = []
-        for y in range(self.maze.height):
-            for x in range(self.maze.width):
-                cell = self.maze.cell(x, y)
-                if (
-                    x < self.maze.width - 1
-                    and cell.walls & RIGHT
-                    and not cell.marked
-                ):
-                    nx = x + 1
-                    if not self.maze.cell(nx, y).marked:
-                        walls.append((x, y, RIGHT, LEFT))
-                if (
-                    y < self.maze.height - 1
-                    and cell.walls & BOTTOM
-                    and not cell.marked
-                ):
-                    ny = y + 1
-                    if not self.maze.cell(x, ny).marked:
-                        walls.append((x, y, BOTTOM, TOP))
-
-        self.rng.shuffle(walls)
-        count: int = max(
-            1, (self.maze.width * self.maze.height) // 10
-        )
+        maze = self.maze
+        width, height = maze.width, maze.height
+        count: int = max(1, (width * height) // 10)
+        tracker = _OpenAreaTracker(maze)
 
+        # Lazy Fisher-Yates over every (cell, RIGHT|BOTTOM) slot:
+        # each draw picks an unseen slot in O(1) without building or
+        # shuffling the full candidate list.
+        swaps: Dict[int, int] = {}
+        remaining: int = 2 * width * height
         removed: int = 0
-        for x, y, wall, opposite in walls:
-            if removed >= count:
-                break
-            nx, ny = x, y
-            if wall == RIGHT:
-                nx = x + 1
-            elif wall == BOTTOM:
-                ny = y + 1
-            self.maze.remove_wall(x, y, wall)
-            self.maze.remove_wall(nx, ny, opposite)
-            if self._creates_3x3(x, y, nx, ny):
-                self.maze.add_wall(x, y, wall)
-                self.maze.add_wall(nx, ny, opposite)
+        rejected: int = 0
+        while remaining and removed < count:
+            pick = self.rng.randrange(remaining)
+            remaining -= 1
+            slot = swaps.get(pick, pick)
+            swaps[pick] = swaps.pop(remaining, remaining)
+
+            x, y = (slot >> 1) % width, (slot >> 1) // width
+            if slot & 1:
+                if y >= height - 1:
+                    continue
+                wall, opposite, nx, ny = BOTTOM, TOP, x, y + 1
+            else:
+                if x >= width - 1:
+                    continue
+                wall, opposite, nx, ny = RIGHT, LEFT, x + 1, y
+            cell = maze.cell(x, y)
+            if (
+                not cell.walls & wall
+                or cell.marked
+                or maze.cell(nx, ny).marked
+            ):
+                continue
+            if tracker.would_open(x, y, wall):
+                rejected += 1
                 continue
+            maze.remove_wall(x, y, wall)
+            maze.remove_wall(nx, ny, opposite)
+            tracker.open_wall(x, y, wall)
             removed += 1
 
-    def _has_3x3_open(self, sx: int, sy: int) -> bool:
-        """Check if a 3x3 block starting at (sx, sy) is open.
+        if profiling.ENABLED:
+            profiling.count(
+                "imperfect.walls_tried", 2 * width * height - remaining
+            )
+            profiling.count("imperfect.walls_kept", removed)
+            profiling.count("imperfect.open_area_checks", removed + rejected)
+            profiling.count("imperfect.open_area_rejects", rejected)
+            profiling.count(
+                "imperfect.windows_counted", tracker.windows_counted()
+            )
+
+    def enforce_borders(self) -> None:
+        """Ensure all outer walls are closed.
+
+        Forces border cells to have their external wall.
+        """
+        self.maze.close_borders()
+
+    def _dfs(self, x: int, y: int) -> None:
+        """Depth-first search carving passages.
+
+        Uses an explicit stack instead of recursion so large mazes
+        do not hit Python's recursion limit.  The stack is an array of
+        flat cell indices, and each cell keeps one byte holding its
+        shuffled direction order (one of 24) and the next direction
+        to try, so memory stays at about 5 bytes per cell.  Orders
+        are drawn with ``rng.shuffle`` when a cell is entered, which
+        consumes the RNG exactly as the recursive backtracker did.
 
         Args:
-            sx: Left column of the 3x3 block.
-            sy: Top row of the 3x3 block.
+            x: Column index.
+            y: Row index.
+        """
+        maze = self.maze
+        rng = self.rng
+        width = maze.width
+        maze.cell(x, y).visited = True
+        # Per cell: order id << 3 | next direction slot (0-4).
+        state = bytearray(width * maze.height)
+        start = y * width + x
+        state[start] = _shuffled_order(rng) << 3
+        stack = array("i", [start])
+        carved = 0
 
-        Returns:
-            True if all 12 internal walls are open.
+        while stack:
+            i = stack[-1]
+            s = state[i]
+            directions = _SHUFFLED[s >> 3]
+            cx, cy = i % width, i // width
+            slot = s & 7
+            while slot < 4:
+                dx, dy, wall, opposite = directions[slot]
+                slot += 1
+                nx, ny = cx + dx, cy + dy
+                if not maze.inside(nx, ny):
+                    continue
+                neighbor = maze.cell(nx, ny)
+                if neighbor.visited:
+                    continue
+
+                maze.remove_wall(cx, cy, wall)
+                maze.remove_wall(nx, ny, opposite)
+                neighbor.visited = True
+                state[i] = (s & ~7) | slot
+                j = ny * width + nx
+                state[j] = _shuffled_order(rng) << 3
+                stack.append(j)
+                carved += 1
+                break
+            else:
+                stack.pop()
+        profiling.count("generate.cells_carved", carved)
+
+    def _carve(
+        self, x: int, y: int, nx: int, ny: int
+    ) -> None:
+        """Open the wall between two orthogonally adjacent cells.
+
+        Args:
+            x: Column of the first cell.
+            y: Row of the first cell.
+            nx: Column of the second cell.
+            ny: Row of the second cell.
         """
-        for dy in range(3):
-            for dx in range(3):
-                cell = self.maze.cell(sx + dx, sy + dy)
-                if dx < 2 and cell.walls & RIGHT:
-                    return False
-                if dy < 2 and cell.walls & BOTTOM:
-                    return False
-        return True
+        for dx, dy, wall, opposite in DIRECTIONS:
+            if (x + dx, y + dy) == (nx, ny):
+                self.maze.remove_wall(x, y, wall)
+                self.maze.remove_wall(nx, ny, opposite)
+                return
 
-    def _creates_3x3(
-        self, x1: int, y1: int, x2: int, y2: int
-    ) -> bool:
-        """Check if removing a wall between two cells created a 3x3.
+    def _region(self, x: int, y: int) -> bytearray:
+        """Flag the unvisited cells reachable from (x, y).
+
+        Walls are ignored; only visited cells (including the ``marked``
+        42 pattern) block the flood, so the result is the set of cells
+        a spanning tree rooted at (x, y) can cover.
 
         Args:
-            x1: Column of first cell.
-            y1: Row of first cell.
-            x2: Column of second cell.
-            y2: Row of second cell.
+            x: Column index.
+            y: Row index.
 
         Returns:
-            True if any 3x3 open area now exists nearby.
-        """
-        min_x: int = max(0, min(x1, x2) - 2)
-        min_y: int = max(0, min(y1, y2) - 2)
-        max_x: int = min(self.maze.width - 3, max(x1, x2))
-        max_y: int = min(self.maze.height - 3, max(y1, y2))
-        for sy in range(min_y, max_y + 1):
-            for sx in range(min_x, max_x + 1):
-                if self._has_3x3_open(sx, sy):
-                    return True
-        return False
+            One byte per cell in row-major order, 1 inside the region.
+        """
+        maze = self.maze
+        width = maze.width
+        region = bytearray(width * maze.height)
+        if maze.cell(x, y).visited:
+            region[y * width + x] = 1
+            return region
+        region[y * width + x] = 1
+        todo = [(x, y)]
+        while todo:
+            cx, cy = todo.pop()
+            for dx, dy, _, _ in DIRECTIONS:
+                nx, ny = cx + dx, cy + dy
+                if (
+                    maze.inside(nx, ny)
+                    and not region[ny * width + nx]
+                    and not maze.cell(nx, ny).visited
+                ):
+                    region[ny * width + nx] = 1
+                    todo.append((nx, ny))
+        return region
 
-    def enforce_borders(self) -> None:
-        """Ensure all outer walls are closed.
+    def _kruskal(self, x: int, y: int) -> None:
+        """Randomized Kruskal's algorithm over a union-find forest.
 
-        Forces border cells to have their external wall.
+        Args:
+            x: Column index.
+            y: Row index.
         """
-        for x in range(self.maze.width):
-            self.maze.add_wall(x, 0, TOP)
-            self.maze.add_wall(
-                x, self.maze.height - 1, BOTTOM
-            )
-        for y in range(self.maze.height):
-            self.maze.add_wall(0, y, LEFT)
-            self.maze.add_wall(
-                self.maze.width - 1, y, RIGHT
-            )
+        maze = self.maze
+        width, height = maze.width, maze.height
+        region = self._region(x, y)
 
-    def _dfs(self, x: int, y: int) -> None:
-        """Depth-first search carving passages.
+        edges: List[Tuple[int, int]] = []
+        for idx in range(width * height):
+            if not region[idx]:
+                continue
+            maze.cell(idx % width, idx // width).visited = True
+            if idx % width < width - 1 and region[idx + 1]:
+                edges.append((idx, idx + 1))
+            if idx + width < width * height and region[idx + width]:
+                edges.append((idx, idx + width))
+        self.rng.shuffle(edges)
+
+        parent = list(range(width * height))
+        size = [1] * (width * height)
+
+        def find(i: int) -> int:
+            while parent[i] != i:
+                parent[i] = parent[parent[i]]
+                i = parent[i]
+            return i
+
+        for a, b in edges:
+            ra, rb = find(a), find(b)
+            if ra == rb:
+                continue
+            if size[ra] < size[rb]:
+                ra, rb = rb, ra
+            parent[rb] = ra
+            size[ra] += size[rb]
+            self._carve(a % width, a // width, b % width, b // width)
+
+    def _prim(self, x: int, y: int) -> None:
+        """Randomized Prim's algorithm with an indexed frontier.
+
+        The frontier is a list plus a position map, so a random cell
+        is removed in O(1) by swapping it with the last entry.
 
         Args:
             x: Column index.
             y: Row index.
         """
-        cell = self.maze.cell(x, y)
-        cell.visited = True
+        maze = self.maze
+        rng = self.rng
+        frontier: List[Tuple[int, int]] = []
+        position: Dict[Tuple[int, int], int] = {}
+
+        def expand(cx: int, cy: int) -> None:
+            for dx, dy, _, _ in DIRECTIONS:
+                nx, ny = cx + dx, cy + dy
+                if (
+                    maze.inside(nx, ny)
+                    and (nx, ny) not in position
+                    and not maze.cell(nx, ny).visited
+                ):
+                    position[(nx, ny)] = len(frontier)
+                    frontier.append((nx, ny))
+
+        maze.cell(x, y).visited = True
+        expand(x, y)
+        while frontier:
+            i = rng.randrange(len(frontier))
+            cx, cy = frontier[i]
+            last = frontier.pop()
+            del position[(cx, cy)]
+            if i < len(frontier):
+                frontier[i] = last
+                position[last] = i
+
+            links = [
+                (cx + dx, cy + dy)
+                for dx, dy, _, _ in DIRECTIONS
+                if maze.inside(cx + dx, cy + dy)
+                and maze.cell(cx + dx, cy + dy).visited
+                and not maze.cell(cx + dx, cy + dy).marked
+            ]
+            nx, ny = links[rng.randrange(len(links))]
+            self._carve(cx, cy, nx, ny)
+            maze.cell(cx, cy).visited = True
+            expand(cx, cy)
 
-        directions = DIRECTIONS[:]
-        self.rng.shuffle(directions)
+    def _wilson(self, x: int, y: int) -> None:
+        """Wilson's algorithm (loop-erased random walks).
 
-        for dx, dy, wall, opposite in directions:
-            nx, ny = x + dx, y + dy
-            if not self.maze.inside(nx, ny):
+        Produces a uniformly random spanning tree of the region
+        reachable from (x, y).
+
+        Args:
+            x: Column index.
+            y: Row index.
+        """
+        maze = self.maze
+        rng = self.rng
+        width = maze.width
+        region = self._region(x, y)
+        maze.cell(x, y).visited = True
+
+        for idx in range(width * maze.height):
+            if not region[idx]:
+                continue
+            sx, sy = idx % width, idx // width
+            if maze.cell(sx, sy).visited:
                 continue
-            neighbor = self.maze.cell(nx, ny)
-            if neighbor.visited:
+
+            step: Dict[Tuple[int, int], Tuple[int, int]] = {}
+            cx, cy = sx, sy
+            while not maze.cell(cx, cy).visited:
+                while True:
+                    dx, dy, _, _ = DIRECTIONS[rng.randrange(4)]
+                    nx, ny = cx + dx, cy + dy
+                    if maze.inside(nx, ny) and region[ny * width + nx]:
+                        break
+                step[(cx, cy)] = (nx, ny)
+                cx, cy = nx, ny
+
+            cx, cy = sx, sy
+            while not maze.cell(cx, cy).visited:
+                maze.cell(cx, cy).visited = True
+                nx, ny = step[(cx, cy)]
+                self._carve(cx, cy, nx, ny)
+                cx, cy = nx, ny
+
+    def _hunt_and_kill(self, x: int, y: int) -> None:
+        """Hunt-and-Kill: random walks restarted by a row scan.
+
+        Needs no stack or frontier; the only extra state is the
+        first row that may still hold unvisited cells.
+
+        Args:
+            x: Column index.
+            y: Row index.
+        """
+        maze = self.maze
+        rng = self.rng
+        width, height = maze.width, maze.height
+        maze.cell(x, y).visited = True
+        hunt_row = 0
+
+        while True:
+            options = [
+                (x + dx, y + dy)
+                for dx, dy, _, _ in DIRECTIONS
+                if maze.inside(x + dx, y + dy)
+                and not maze.cell(x + dx, y + dy).visited
+            ]
+            if options:
+                nx, ny = options[rng.randrange(len(options))]
+                self._carve(x, y, nx, ny)
+                maze.cell(nx, ny).visited = True
+                x, y = nx, ny
                 continue
 
-            self.maze.remove_wall(x, y, wall)
-            self.maze.remove_wall(nx, ny, opposite)
-            self._dfs(nx, ny)
+            found = False
+            for hy in range(hunt_row, height):
+                row_done = True
+                for hx in range(width):
+                    if maze.cell(hx, hy).visited:
+                        continue
+                    links = [
+                        (hx + dx, hy + dy)
+                        for dx, dy, _, _ in DIRECTIONS
+                        if maze.inside(hx + dx, hy + dy)
+                        and maze.cell(hx + dx, hy + dy).visited
+                        and not maze.cell(hx + dx, hy + dy).marked
+                    ]
+                    if not links:
+                        row_done = False
+                        continue
+                    nx, ny = links[rng.randrange(len(links))]
+                    self._carve(hx, hy, nx, ny)
+                    maze.cell(hx, hy).visited = True
+                    x, y = hx, hy
+                    found = True
+                    break
+                if found:
+                    break
+                if row_done and hy == hunt_row:
+                    hunt_row += 1
+            if not found:
+                return
+
+    def _binary_tree(self, x: int, y: int) -> None:
+        """Binary Tree, carved a whole row at a time (see bulk).
+
+        The start cell is irrelevant: every cell links north or east.
+
+        Args:
+            x: Column index (unused).
+            y: Row index (unused).
+        """
+        binary_tree(self.maze, self.rng)
+
+    def _sidewinder(self, x: int, y: int) -> None:
+        """Sidewinder, carved a whole row at a time (see bulk).
+
+        The start cell is irrelevant: rows are processed in order.
+
+        Args:
+            x: Column index (unused).
+            y: Row index (unused).
+        """
+        sidewinder(self.maze, self.rng)
+
+    ALGORITHMS: ClassVar[Dict[str, Algorithm]] = {
+        "backtracker": _dfs,
+        "kruskal": _kruskal,
+        "prim": _prim,
+        "wilson": _wilson,
+        "hunt_and_kill": _hunt_and_kill,
+        "binary_tree": _binary_tree,
+        "sidewinder": _sidewinder,
+    }
+
+
+def _shuffled_order(rng: random.Random) -> int:
+    """Shuffle the four directions and return the order's id.
+
+    Args:
+        rng: Random source; consumed exactly as by shuffling a copy
+            of DIRECTIONS.
+
+    Returns:
+        Index into ``_SHUFFLED``.
+    """
+    order = [0, 1, 2, 3]
+    rng.shuffle(order)
+    return _ORDER_ID[tuple(order)]
+
+
+class _OpenAreaTracker:
+    """Count open internal walls in every 3x3 window of a maze.
+
+    A window is identified by its top-left cell and has 12 internal
+    walls; it is an open 3x3 area when all of them are open.  Counts
+    are computed on first use and then updated in O(1) per removed
+    wall, so checking a removal never rescans the grid.
+    """
+
+    _UNKNOWN = 0xFF
+
+    def __init__(self, maze: Maze) -> None:
+        """Prepare empty counters for every window of *maze*.
+
+        Args:
+            maze: The maze whose walls are tracked.
+        """
+        self.maze = maze
+        self.cols = max(0, maze.width - 2)
+        self.rows = max(0, maze.height - 2)
+        self.counts = bytearray(
+            [self._UNKNOWN] * (self.cols * self.rows)
+        )
+
+    def windows_counted(self) -> int:
+        """Return how many windows have had their walls counted.
+
+        Windows are counted lazily, so this measures how much of the
+        grid the open-area checks actually looked at.
+
+        Returns:
+            Number of windows whose count is known.
+        """
+        return len(self.counts) - self.counts.count(self._UNKNOWN)
+
+    def _windows(self, x: int, y: int, wall: int) -> List[int]:
+        """Return the indices of the windows containing a wall.
+
+        Args:
+            x: Column of the cell owning the wall.
+            y: Row of the cell owning the wall.
+            wall: RIGHT or BOTTOM.
+
+        Returns:
+            Flat window indices (at most six).
+        """
+        if wall == RIGHT:
+            x_lo, y_lo = x - 1, y - 2
+        else:
+            x_lo, y_lo = x - 2, y - 1
+        return [
+            sy * self.cols + sx
+            for sy in range(max(0, y_lo), min(self.rows - 1, y) + 1)
+            for sx in range(max(0, x_lo), min(self.cols - 1, x) + 1)
+        ]
+
+    def _count(self, index: int) -> int:
+        """Return the open internal walls of a window.
+
+        Args:
+            index: Flat window index.
+
+        Returns:
+            Number of open internal walls, from 0 to 12.
+        """
+        value = self.counts[index]
+        if value != self._UNKNOWN:
+            return value
+        sx, sy = index % self.cols, index // self.cols
+        cell = self.maze.cell
+        value = 12
+        for y in range(sy, sy + 3):
+            a = cell(sx, y).walls
+            b = cell(sx + 1, y).walls
+            value -= bool(a & RIGHT) + bool(b & RIGHT)
+            if y < sy + 2:
+                c = cell(sx + 2, y).walls
+                value -= (
+                    bool(a & BOTTOM) + bool(b & BOTTOM) + bool(c & BOTTOM)
+                )
+        self.counts[index] = value
+        return value
+
+    def would_open(self, x: int, y: int, wall: int) -> bool:
+        """Check whether opening a wall would complete a 3x3 area.
+
+        Args:
+            x: Column of the cell owning the wall.
+            y: Row of the cell owning the wall.
+            wall: RIGHT or BOTTOM; must currently be closed.
+
+        Returns:
+            True if some window would end up with all 12 walls open.
+        """
+        return any(
+            self._count(index) == 11
+            for index in self._windows(x, y, wall)
+        )
+
+    def open_wall(self, x: int, y: int, wall: int) -> None:
+        """Record that a closed wall has just been opened.
+
+        Args:
+            x: Column of the cell owning the wall.
+            y: Row of the cell owning the wall.
+            wall: RIGHT or BOTTOM.
+        """
+        counts = self.counts
+        for index in self._windows(x, y, wall):
+            if counts[index] != self._UNKNOWN:
+                counts[index] += 1
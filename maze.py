@@ -1,11 +1,23 @@
 """Maze module containing the Maze grid class."""
 
-from typing import List
-from cell import Cell
+import re
+from typing import (
+    TYPE_CHECKING, Dict, Iterator, List, Sequence, Tuple, Union, overload
+)
+from cell import Cell, TOP, RIGHT, BOTTOM, LEFT
+
+if TYPE_CHECKING:
+    from solver import DistanceField
+
+_NONZERO = re.compile(b"[^\x00]+")
 
 
 class Maze:
-    """Represent a 2D grid of cells forming a maze."""
+    """Represent a 2D grid of cells forming a maze.
+
+    ``revision`` is bumped by every ``add_wall``/``remove_wall`` call
+    and invalidates the cached ``distance_fields``.
+    """
 
     def __init__(self, width: int, height: int) -> None:
         """Initialise a maze with all walls closed.
@@ -20,6 +32,8 @@ class Maze:
             [Cell() for _ in range(width)]
             for _ in range(height)
         ]
+        self.revision = 0
+        self.distance_fields: Dict[Tuple[int, int], "DistanceField"] = {}
 
     def inside(self, x: int, y: int) -> bool:
         """Check if coordinates are within bounds.
@@ -56,6 +70,7 @@ class Maze:
             wall: Bitmask of the wall to remove.
         """
         self.cell(x, y).walls &= ~wall
+        self.revision += 1
 
     def add_wall(
         self, x: int, y: int, wall: int
@@ -68,3 +83,278 @@ class Maze:
             wall: Bitmask of the wall to add.
         """
         self.cell(x, y).walls |= wall
+        self.revision += 1
+
+    def close_borders(self) -> None:
+        """Close every wall on the outer edge of the grid."""
+        for x in range(self.width):
+            self.add_wall(x, 0, TOP)
+            self.add_wall(x, self.height - 1, BOTTOM)
+        for y in range(self.height):
+            self.add_wall(0, y, LEFT)
+            self.add_wall(self.width - 1, y, RIGHT)
+
+    def inconsistent_walls(self) -> List[Tuple[int, int, int]]:
+        """Find walls that disagree with the neighbouring cell.
+
+        The whole grid is compared at once: ``wall_bytes`` is read as
+        one big integer, one byte lane per cell, and each cell's
+        RIGHT and BOTTOM bits are XORed with the LEFT bit of the next
+        cell and the TOP bit of the cell below.  Only the cells with
+        a mismatch are visited in Python.
+
+        Returns:
+            (x, y, wall) tuples for every RIGHT or BOTTOM wall of
+            (x, y) whose state differs from the matching LEFT or TOP
+            wall of its neighbour, in row-major order.
+        """
+        width, size = self.width, self.width * self.height
+        w = int.from_bytes(self.wall_bytes(), "little")
+        ones = int.from_bytes(b"\x01" * size, "little")
+        inner_cols = int.from_bytes(
+            (b"\x01" * (width - 1) + b"\x00") * self.height, "little"
+        )
+        upper_rows = ones >> 8 * width
+        right = ((w >> 1) ^ (w >> (8 + 3))) & inner_cols
+        bottom = ((w >> 2) ^ (w >> 8 * width)) & upper_rows
+        flags = (right | (bottom << 1)).to_bytes(size, "little")
+        bad: List[Tuple[int, int, int]] = []
+        for run in _NONZERO.finditer(flags):
+            for i in range(run.start(), run.end()):
+                x, y = i % width, i // width
+                if flags[i] & 1:
+                    bad.append((x, y, RIGHT))
+                if flags[i] & 2:
+                    bad.append((x, y, BOTTOM))
+        return bad
+
+    def wall_bytes(self) -> bytes:
+        """Return the walls of every cell as one flat buffer.
+
+        Only the low four bits of each byte are meaningful; the
+        buffer is a snapshot and does not follow later changes.
+
+        Returns:
+            One byte per cell, row-major.
+        """
+        return bytes(
+            cell.walls for row in self.grid for cell in row
+        )
+
+
+VISITED: int = 16
+MARKED: int = 32
+
+
+class CompactCell(Cell):
+    """Lightweight view of one cell inside a CompactMaze.
+
+    Reads and writes go straight to the owning maze's byte buffer,
+    so a view can be discarded and recreated at any time.
+    """
+
+    def __init__(self, data: bytearray, index: int) -> None:
+        """Bind the view to a byte of the maze buffer.
+
+        Args:
+            data: The maze's packed cell buffer.
+            index: Flat index of the cell in *data*.
+        """
+        self._data = data
+        self._index = index
+
+    @property
+    def walls(self) -> int:
+        """Bitmask of closed walls."""
+        return self._data[self._index] & 0xF
+
+    @walls.setter
+    def walls(self, value: int) -> None:
+        data = self._data
+        data[self._index] = (data[self._index] & ~0xF) | (value & 0xF)
+
+    @property
+    def visited(self) -> bool:
+        """Whether the generator has visited this cell."""
+        return bool(self._data[self._index] & VISITED)
+
+    @visited.setter
+    def visited(self, value: bool) -> None:
+        if value:
+            self._data[self._index] |= VISITED
+        else:
+            self._data[self._index] &= ~VISITED
+
+    @property
+    def marked(self) -> bool:
+        """Whether the cell belongs to the 42 pattern."""
+        return bool(self._data[self._index] & MARKED)
+
+    @marked.setter
+    def marked(self, value: bool) -> None:
+        if value:
+            self._data[self._index] |= MARKED
+        else:
+            self._data[self._index] &= ~MARKED
+
+
+class _CompactRow(Sequence[Cell]):
+    """Lazy sequence of the CompactCell views of one row."""
+
+    def __init__(self, data: bytearray, start: int, width: int) -> None:
+        """Bind the row to its slice of the maze buffer.
+
+        Args:
+            data: The maze's packed cell buffer.
+            start: Flat index of the first cell in the row.
+            width: Number of cells in the row.
+        """
+        self._data = data
+        self._start = start
+        self._width = width
+
+    def __len__(self) -> int:
+        """Return the number of cells in the row."""
+        return self._width
+
+    @overload
+    def __getitem__(self, index: int) -> Cell:
+        ...
+
+    @overload
+    def __getitem__(self, index: slice) -> Sequence[Cell]:
+        ...
+
+    def __getitem__(
+        self, index: Union[int, slice]
+    ) -> Union[Cell, Sequence[Cell]]:
+        """Return the view at *index* (or a list for a slice)."""
+        if isinstance(index, slice):
+            return [self[i] for i in range(self._width)[index]]
+        if index < 0:
+            index += self._width
+        if not 0 <= index < self._width:
+            raise IndexError("row index out of range")
+        return CompactCell(self._data, self._start + index)
+
+    def __iter__(self) -> Iterator[Cell]:
+        """Yield a view for every cell of the row."""
+        data = self._data
+        for i in range(self._start, self._start + self._width):
+            yield CompactCell(data, i)
+
+
+class _CompactGrid(Sequence[Sequence[Cell]]):
+    """Lazy sequence of rows over a CompactMaze buffer."""
+
+    def __init__(self, maze: "CompactMaze") -> None:
+        """Bind the grid view to *maze*.
+
+        Args:
+            maze: The compact maze to expose.
+        """
+        self._maze = maze
+
+    def __len__(self) -> int:
+        """Return the number of rows."""
+        return self._maze.height
+
+    @overload
+    def __getitem__(self, index: int) -> Sequence[Cell]:
+        ...
+
+    @overload
+    def __getitem__(self, index: slice) -> Sequence[Sequence[Cell]]:
+        ...
+
+    def __getitem__(
+        self, index: Union[int, slice]
+    ) -> Union[Sequence[Cell], Sequence[Sequence[Cell]]]:
+        """Return the row at *index* (or a list for a slice)."""
+        height = self._maze.height
+        if isinstance(index, slice):
+            return [self[i] for i in range(height)[index]]
+        if index < 0:
+            index += height
+        if not 0 <= index < height:
+            raise IndexError("grid index out of range")
+        width = self._maze.width
+        return _CompactRow(self._maze.data, index * width, width)
+
+
+class CompactMaze(Maze):
+    """Maze storing every cell in a single byte of a flat buffer.
+
+    Bits 0-3 hold the walls, bit 4 the visited flag and bit 5 the
+    marked flag.  ``cell`` and ``grid`` return CompactCell views, so
+    code written against Maze works unchanged.
+    """
+
+    def __init__(self, width: int, height: int) -> None:
+        """Initialise a compact maze with all walls closed.
+
+        Args:
+            width: Number of columns.
+            height: Number of rows.
+        """
+        self.width = width
+        self.height = height
+        self.data = bytearray(b"\x0f" * (width * height))
+        self.revision = 0
+        self.distance_fields: Dict[Tuple[int, int], "DistanceField"] = {}
+
+    @property
+    def grid(  # type: ignore[override]
+        self,
+    ) -> Sequence[Sequence[Cell]]:
+        """Row-major grid of cell views, created lazily."""
+        return _CompactGrid(self)
+
+    def wall_bytes(self) -> bytes:
+        """Return a copy of the packed cell buffer.
+
+        Only the low four bits of each byte are walls; the upper bits
+        hold the visited and marked flags.
+
+        Returns:
+            One byte per cell, row-major.
+        """
+        return bytes(self.data)
+
+    def cell(self, x: int, y: int) -> Cell:
+        """Return a view of the cell at position (x, y).
+
+        Args:
+            x: Column index.
+            y: Row index.
+
+        Returns:
+            A CompactCell bound to that position.
+        """
+        return CompactCell(self.data, y * self.width + x)
+
+    def remove_wall(
+        self, x: int, y: int, wall: int
+    ) -> None:
+        """Remove a wall from the cell at (x, y).
+
+        Args:
+            x: Column index.
+            y: Row index.
+            wall: Bitmask of the wall to remove.
+        """
+        self.data[y * self.width + x] &= ~wall
+        self.revision += 1
+
+    def add_wall(
+        self, x: int, y: int, wall: int
+    ) -> None:
+        """Add a wall to the cell at (x, y).
+
+        Args:
+            x: Column index.
+            y: Row index.
+            wall: Bitmask of the wall to add.
+        """
+        self.data[y * self.width + x] |= wall & 0xF
+        self.revision += 1
@@ -40,6 +40,41 @@ Accessing the structure
   (TOP=1, RIGHT=2, BOTTOM=4, LEFT=8).
 - ``maze.grid`` — 2-D list of ``Cell`` objects (row-major).
 - ``maze.width`` / ``maze.height`` — grid dimensions.
+- ``CompactMaze(width, height)`` — same API as ``Maze`` but packs each
+  cell into one byte of a flat ``bytearray`` (``maze.data``);
+  ``cell()`` and ``grid`` return lightweight views.
+
+Streaming generation
+--------------------
+- ``mazegen.eller.eller_rows(width, height, seed)`` — yields a perfect
+  maze one row of wall masks at a time (Eller's algorithm, O(width)
+  memory).
+
+Loading saved mazes
+-------------------
+- ``mazegen.loader.load_hex_maze(path, compact=False)`` — reads an
+  ``OUTPUT_FILE`` back into ``(maze, entry, exit, solution)``.
+- ``mazegen.loader.iter_hex_rows(path)`` — yields the wall masks one
+  row at a time, for files too large to load.
+
+Image export
+------------
+- ``mazegen.raster.write_png(maze, path, entry, exit, solution)`` and
+  ``write_ppm(...)`` — draw walls, the 42 pattern, entry, exit and the
+  solution; ``cell_size`` sets the pixels per cell.
+- ``mazegen.svg.write_svg(maze, path, entry, exit, solution)`` —
+  vector image with collinear walls merged into single path segments.
+
+Optional NumPy backend
+----------------------
+- ``mazegen.numpy_maze.NumpyMaze`` — requires NumPy; vectorizes
+  border closing and wall consistency checks.
+
+Profiling
+---------
+- ``mazegen.profiling.enable()`` — turns on hot-path counters and
+  timing spans; ``summary()`` and ``write_trace(path)`` (Chrome trace
+  JSON) report them.
 
 Accessing a solution
 --------------------
@@ -48,12 +83,13 @@ Accessing a solution
 """
 
 from .cell import Cell, TOP, RIGHT, BOTTOM, LEFT
-from .maze import Maze
+from .maze import CompactMaze, Maze
 from .generator import MazeGenerator
 from .solver import shortest_path
 
 __all__ = [
     "Cell",
+    "CompactMaze",
     "Maze",
     "MazeGenerator",
     "shortest_path",
@@ -0,0 +1,67 @@
+"""Row-streaming perfect maze generator using Eller's algorithm."""
+
+import random
+from typing import Dict, Iterator, List, Optional
+
+from .cell import TOP, RIGHT, BOTTOM, LEFT
+
+
+def eller_rows(
+    width: int, height: int, seed: Optional[int] = None
+) -> Iterator[bytes]:
+    """Yield the wall masks of a perfect maze one row at a time.
+
+    Only the current row's set labels are kept, so memory is
+    O(width) whatever the height.  Outer walls are always closed, as
+    after ``MazeGenerator.enforce_borders``.
+
+    Args:
+        width: Number of columns.
+        height: Number of rows.
+        seed: Optional RNG seed for reproducibility.
+
+    Yields:
+        One ``bytes`` object of length *width* per row, each byte a
+        wall bitmask (TOP=1, RIGHT=2, BOTTOM=4, LEFT=8).
+    """
+    rng = random.Random(seed)
+    sets: List[int] = [0] * width
+    next_set = 0
+    open_above = bytearray(width)
+
+    for y in range(height):
+        last = y == height - 1
+        members: Dict[int, List[int]] = {}
+        row = bytearray(width)
+        for x in range(width):
+            if open_above[x]:
+                row[x] = RIGHT | BOTTOM | LEFT
+            else:
+                next_set += 1
+                sets[x] = next_set
+                row[x] = TOP | RIGHT | BOTTOM | LEFT
+            members.setdefault(sets[x], []).append(x)
+
+        for x in range(width - 1):
+            keep, gone = sets[x], sets[x + 1]
+            if keep == gone or not (last or rng.random() < 0.5):
+                continue
+            row[x] &= ~RIGHT
+            row[x + 1] &= ~LEFT
+            if len(members[keep]) < len(members[gone]):
+                keep, gone = gone, keep
+            for col in members[gone]:
+                sets[col] = keep
+            members[keep].extend(members.pop(gone))
+
+        open_above = bytearray(width)
+        if not last:
+            for cols in members.values():
+                down = [col for col in cols if rng.random() < 0.5]
+                if not down:
+                    down = [cols[rng.randrange(len(cols))]]
+                for col in down:
+                    row[col] &= ~BOTTOM
+                    open_above[col] = 1
+
+        yield bytes(row)
@@ -0,0 +1,408 @@
+"""Junction graph: a maze with its corridors contracted to edges.
+
+Cells with exactly two open sides are corridor cells; every other
+cell (dead end, junction, isolated cell) is a node.  Each corridor
+becomes one weighted edge between the nodes at its ends, so shortest
+path queries run A* (Dijkstra with a Manhattan potential) on a graph
+far smaller than the grid and only walk the corridors that end up on
+the answer.
+
+When the graph is a forest (a perfect maze), it is rooted once and a
+query just climbs from both ends to their lowest common ancestor: the
+path is unique, so the work is proportional to its length and no
+search runs at all.
+"""
+
+import heapq
+from array import array
+from typing import List, Optional, Tuple
+
+from .cell import TOP, RIGHT, BOTTOM, LEFT
+from .maze import Maze
+from .solver import shortest_path
+
+Point = Tuple[int, int]
+Edge = Tuple[int, int, int]
+
+_UNSEEN = 1 << 62
+
+
+class JunctionGraph:
+    """Weighted graph of the junctions and dead ends of a maze.
+
+    The graph is a snapshot: rebuild it after changing walls
+    (``revision`` records the maze revision it was built from).
+    """
+
+    def __init__(self, maze: Maze) -> None:
+        """Contract every corridor of *maze* into a weighted edge.
+
+        Args:
+            maze: The Maze to compress.
+        """
+        self.maze = maze
+        self.width = maze.width
+        self.height = maze.height
+        self.revision = maze.revision
+        self.walls = maze.wall_bytes()
+        size = self.width * self.height
+        self.degree = bytearray(
+            len(self._steps(i)) for i in range(size)
+        )
+        self.nodes: List[int] = [
+            i for i in range(size) if self.degree[i] != 2
+        ]
+        self.node_id = array("l", [-1]) * size
+        for n, i in enumerate(self.nodes):
+            self.node_id[i] = n
+        # node id -> [(other node id, corridor length, first cell)]
+        self.edges: List[List[Edge]] = []
+        for i in self.nodes:
+            out: List[Edge] = []
+            for first in self._steps(i):
+                end, length = self._walk(i, first)
+                out.append((self.node_id[end], length, first))
+            self.edges.append(out)
+        self.forest = self._root()
+
+    def _root(self) -> bool:
+        """Root every component of the graph at its first node.
+
+        Fills ``parent`` (node id of the parent, -1 for a root),
+        ``depth`` (edges to the root) and ``down`` (first cell of the
+        corridor from the parent), one breadth-first pass per
+        component.
+
+        Returns:
+            True if the graph is a forest, i.e. has no cycle, so the
+            tree paths are the only paths.
+        """
+        count = len(self.nodes)
+        self.parent = array("l", [-1]) * count
+        self.depth = array("l", [-1]) * count
+        self.down = array("l", [-1]) * count
+        parent, depth, down = self.parent, self.depth, self.down
+        components = 0
+        for root in range(count):
+            if depth[root] >= 0:
+                continue
+            components += 1
+            depth[root] = 0
+            queue = [root]
+            for u in queue:
+                for v, _, first in self.edges[u]:
+                    if depth[v] < 0:
+                        depth[v] = depth[u] + 1
+                        parent[v] = u
+                        down[v] = first
+                        queue.append(v)
+        edges = sum(len(out) for out in self.edges) // 2
+        return edges == count - components
+
+    def _steps(self, i: int) -> List[int]:
+        """Return the cells reachable from cell *i* in one step.
+
+        Args:
+            i: Flat cell index.
+
+        Returns:
+            Flat indices in TOP, RIGHT, BOTTOM, LEFT order.
+        """
+        w = self.walls[i]
+        width = self.width
+        x = i % width
+        out: List[int] = []
+        if not w & TOP and i >= width:
+            out.append(i - width)
+        if not w & RIGHT and x < width - 1:
+            out.append(i + 1)
+        if not w & BOTTOM and i < (self.height - 1) * width:
+            out.append(i + width)
+        if not w & LEFT and x > 0:
+            out.append(i - 1)
+        return out
+
+    def _next(self, prev: int, cur: int) -> int:
+        """Return the corridor cell after *cur* when coming from *prev*.
+
+        Args:
+            prev: Previous cell.
+            cur: Current corridor cell (degree 2).
+
+        Returns:
+            The other open neighbour of *cur*.
+        """
+        w = self.walls[cur]
+        width = self.width
+        if not w & TOP and cur >= width and cur - width != prev:
+            return cur - width
+        x = cur % width
+        if not w & RIGHT and x < width - 1 and cur + 1 != prev:
+            return cur + 1
+        if (
+            not w & BOTTOM
+            and cur < (self.height - 1) * width
+            and cur + width != prev
+        ):
+            return cur + width
+        return cur - 1
+
+    def _walk(self, node: int, first: int) -> Tuple[int, int]:
+        """Follow a corridor from *node* until the next node.
+
+        Args:
+            node: Flat index of the starting node.
+            first: First cell of the corridor.
+
+        Returns:
+            (end node, corridor length in steps).
+        """
+        prev, cur, length = node, first, 1
+        while self.degree[cur] == 2:
+            prev, cur = cur, self._next(prev, cur)
+            length += 1
+        return cur, length
+
+    def _trail(self, prev: int, cur: int) -> List[int]:
+        """List the cells from *cur* to the next node, inclusive.
+
+        Args:
+            prev: Cell the walk comes from.
+            cur: First cell of the walk.
+
+        Returns:
+            Flat indices, ending at a node (or back at the walk's
+            origin on a junction-free loop).
+        """
+        origin = prev
+        cells = [cur]
+        while self.degree[cur] == 2 and cur != origin:
+            prev, cur = cur, self._next(prev, cur)
+            cells.append(cur)
+        return cells
+
+    def _anchors(self, i: int) -> List[Tuple[int, List[int]]]:
+        """Return the nodes bounding the corridor that holds cell *i*.
+
+        Args:
+            i: Flat cell index.
+
+        Returns:
+            (node, cells after *i* up to the node) pairs; a single
+            ``(i, [])`` pair when *i* is itself a node, and an empty
+            list on a junction-free loop.
+        """
+        if self.degree[i] != 2:
+            return [(i, [])]
+        anchors = []
+        for first in self._steps(i):
+            cells = self._trail(i, first)
+            if cells[-1] == i:
+                return []
+            anchors.append((cells[-1], cells))
+        return anchors
+
+    def path(self, start: Point, end: Point) -> List[Point]:
+        """Return a shortest path from start to end.
+
+        Args:
+            start: Starting cell coordinates.
+            end: Target cell coordinates.
+
+        Returns:
+            Ordered list of (x, y) points on the path, in the same
+            format as ``shortest_path``, or an empty list.
+        """
+        width = self.width
+        s = start[1] * width + start[0]
+        t = end[1] * width + end[0]
+        if s == t:
+            return [start]
+        sources, targets = self._anchors(s), self._anchors(t)
+        if not sources or not targets:
+            return shortest_path(self.maze, start, end)
+
+        best: Optional[int] = None
+        direct: List[int] = []
+        for _, cells in sources:
+            if t in cells:
+                steps = cells.index(t) + 1
+                if best is None or steps < best:
+                    best = steps
+                    direct = [s] + cells[:steps]
+        if self.forest:
+            cells = direct or self._climb(s, t, sources, targets)
+            return [(i % width, i // width) for i in cells]
+
+        node_id = self.node_id
+        count = len(self.nodes)
+        # node id -> index in targets / sources, or -1
+        goal = array("l", [-1]) * count
+        for k, (node, cells) in enumerate(targets):
+            n = node_id[node]
+            if goal[n] < 0 or len(cells) < len(targets[goal[n]][1]):
+                goal[n] = k
+        dist = [_UNSEEN] * count
+        pred = array("l", [-1]) * count
+        via = array("l", [-1]) * count
+        seed = array("l", [-1]) * count
+        heap: List[Tuple[int, int]] = []
+        # Manhattan potential, inlined below: a corridor is never
+        # shorter than the distance between its ends, so it is
+        # consistent and the first goal settled under the bound wins.
+        tx, ty = t % width, t // width
+        for k, (node, cells) in enumerate(sources):
+            n = node_id[node]
+            if len(cells) < dist[n]:
+                dist[n] = len(cells)
+                seed[n] = k
+                heapq.heappush(heap, (
+                    len(cells)
+                    + abs(node % width - tx) + abs(node // width - ty),
+                    n,
+                ))
+
+        found = -1
+        edges = self.edges
+        nodes = self.nodes
+        while heap:
+            f, u = heapq.heappop(heap)
+            d = dist[u]
+            i = nodes[u]
+            if f > d + abs(i % width - tx) + abs(i // width - ty):
+                continue
+            if best is not None and f >= best:
+                break
+            k = goal[u]
+            if k >= 0 and (best is None or d + len(targets[k][1]) < best):
+                best = d + len(targets[k][1])
+                found = u
+            for v, weight, first in edges[u]:
+                nd = d + weight
+                if nd < dist[v]:
+                    dist[v] = nd
+                    pred[v] = u
+                    via[v] = first
+                    seed[v] = -1
+                    i = nodes[v]
+                    heapq.heappush(heap, (
+                        nd + abs(i % width - tx) + abs(i // width - ty),
+                        v,
+                    ))
+
+        if found < 0:
+            cells = direct
+        else:
+            cells = self._expand(s, found, pred, via, sources, seed)
+            tail = targets[goal[found]][1]
+            if tail:
+                cells += tail[-2::-1] + [t]
+        return [(i % width, i // width) for i in cells]
+
+    def _climb(
+        self,
+        s: int,
+        t: int,
+        sources: List[Tuple[int, List[int]]],
+        targets: List[Tuple[int, List[int]]],
+    ) -> List[int]:
+        """Return the tree path from *s* to *t* in a forest.
+
+        Both ends climb towards the root, the deeper one first, until
+        they meet.  A corridor cell ranks between the nodes at the
+        ends of its corridor: its first climb leads to the parent one,
+        and the other end stops at it when climbing from the child.
+
+        Args:
+            s: Flat index of the start cell.
+            t: Flat index of the target cell.
+            sources: Anchors of *s* (see ``_anchors``).
+            targets: Anchors of *t*.
+
+        Returns:
+            Flat indices from *s* to *t*, or an empty list if they lie
+            in different trees.
+        """
+        parent, depth, node_id = self.parent, self.depth, self.node_id
+        cells = [[s], [t]]
+        node = [0, 0]
+        rank = [0, 0]
+        child = [-1, -1]
+        up: List[Optional[List[int]]] = [None, None]
+        down: List[List[int]] = [[], []]
+        for k, anchors in enumerate((sources, targets)):
+            n = node_id[anchors[0][0]]
+            if len(anchors) == 1:
+                node[k], rank[k] = n, 2 * depth[n]
+                continue
+            m = node_id[anchors[1][0]]
+            if parent[m] == n:
+                node[k], child[k] = n, m
+                up[k], down[k] = anchors[0][1], anchors[1][1]
+            else:
+                node[k], child[k] = m, n
+                up[k], down[k] = anchors[1][1], anchors[0][1]
+            rank[k] = 2 * depth[node[k]] + 1
+
+        while up[0] is not None or up[1] is not None or node[0] != node[1]:
+            k = 0 if rank[0] >= rank[1] else 1
+            other = 1 - k
+            pending = up[k]
+            if pending is not None:
+                cells[k] += pending
+                up[k] = None
+            elif up[other] is not None and child[other] == node[k]:
+                cells[k] += down[other][-2::-1] + [cells[other][0]]
+                break
+            elif parent[node[k]] < 0:
+                return []
+            else:
+                cells[k] += self._rise(node[k])
+                node[k] = parent[node[k]]
+            rank[k] = 2 * depth[node[k]]
+        return cells[0] + cells[1][-2::-1]
+
+    def _rise(self, n: int) -> List[int]:
+        """List the cells from node *n* up to its parent.
+
+        Args:
+            n: Id of a node that is not a root.
+
+        Returns:
+            Flat indices after *n*, ending at its parent.
+        """
+        p = self.nodes[self.parent[n]]
+        return self._trail(p, self.down[n])[-2::-1] + [p]
+
+    def _expand(
+        self,
+        s: int,
+        node: int,
+        pred: "array[int]",
+        via: "array[int]",
+        sources: List[Tuple[int, List[int]]],
+        seed: "array[int]",
+    ) -> List[int]:
+        """Rebuild the cell path from *s* to *node*.
+
+        Args:
+            s: Flat index of the start cell.
+            node: Id of the node reached by the search.
+            pred: Node id -> previous node id.
+            via: Node id -> first corridor cell from the previous node.
+            sources: Anchors of *s* (see ``_anchors``).
+            seed: Node id -> index in *sources* for nodes reached
+                directly from *s*, else -1.
+
+        Returns:
+            Flat indices from *s* to *node*, inclusive.
+        """
+        pieces: List[List[int]] = []
+        while seed[node] < 0:
+            prev = pred[node]
+            pieces.append(self._trail(self.nodes[prev], via[node]))
+            node = prev
+        cells = [s] + sources[seed[node]][1]
+        for piece in reversed(pieces):
+            cells += piece
+        return cells
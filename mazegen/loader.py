@@ -0,0 +1,144 @@
+"""Load mazes back from the hex text format written by the app.
+
+The file holds one line of hex digits per row (TOP=1, RIGHT=2,
+BOTTOM=4, LEFT=8), an empty line, then the entry, the exit and the
+solution as N, E, S, W letters.  Whole lines are decoded with
+``bytes.translate`` instead of parsing each digit.
+"""
+
+from typing import BinaryIO, Iterator, List, Tuple
+
+from .maze import CompactMaze, Maze
+
+Point = Tuple[int, int]
+
+_BAD = 0xFF
+_DECODE = bytearray([_BAD]) * 256
+for _value, _digit in enumerate(b"0123456789ABCDEF"):
+    _DECODE[_digit] = _value
+    _DECODE[bytes([_digit]).lower()[0]] = _value
+_DECODE_TABLE = bytes(_DECODE)
+
+_STEPS = {"N": (0, -1), "E": (1, 0), "S": (0, 1), "W": (-1, 0)}
+
+
+def iter_hex_rows(path: str) -> Iterator[bytes]:
+    """Yield the wall masks of a hex maze file one row at a time.
+
+    Only the current line is held in memory, so files larger than
+    RAM can be scanned.  Spaces between digits are ignored.
+
+    Args:
+        path: File written by ``write_hex_maze`` or ``write_hex_rows``.
+
+    Yields:
+        One ``bytes`` object per row, one wall bitmask per cell.
+
+    Raises:
+        RuntimeError: If the file cannot be read or a row is invalid.
+    """
+    try:
+        with open(path, "rb") as f:
+            yield from _decode_rows(f)
+    except OSError as exc:
+        raise RuntimeError(f"Cannot read maze file: {exc}") from exc
+
+
+def load_hex_maze(
+    path: str, compact: bool = False
+) -> Tuple[Maze, Point, Point, List[Point]]:
+    """Load a hex maze file into a Maze.
+
+    Args:
+        path: File written by ``write_hex_maze`` or ``write_hex_rows``.
+        compact: Build a CompactMaze instead of a Maze.
+
+    Returns:
+        (maze, entry, exit, solution), the solution as the list of
+        points from entry to exit, or an empty list if the file has
+        none.
+
+    Raises:
+        RuntimeError: If the file cannot be read or is malformed.
+    """
+    try:
+        with open(path, "rb") as f:
+            rows = list(_decode_rows(f))
+            trailer = [line.strip() for line in f]
+    except OSError as exc:
+        raise RuntimeError(f"Cannot read maze file: {exc}") from exc
+
+    if len(trailer) < 2:
+        raise RuntimeError("Missing entry or exit line")
+    entry = _parse_point(trailer[0], "entry")
+    exit_pt = _parse_point(trailer[1], "exit")
+    letters = trailer[2].decode("ascii", "replace") if len(trailer) > 2 else ""
+
+    width, height = len(rows[0]) if rows else 0, len(rows)
+    maze: Maze
+    if compact:
+        maze = CompactMaze(width, height)
+        maze.data[:] = b"".join(rows)
+    else:
+        maze = Maze(width, height)
+        for cells, row in zip(maze.grid, rows):
+            for cell, walls in zip(cells, row):
+                cell.walls = walls
+
+    solution = [entry] if letters else []
+    x, y = entry
+    for letter in letters:
+        if letter not in _STEPS:
+            raise RuntimeError(f"Invalid direction {letter!r} in solution")
+        dx, dy = _STEPS[letter]
+        x, y = x + dx, y + dy
+        solution.append((x, y))
+    return maze, entry, exit_pt, solution
+
+
+def _decode_rows(f: BinaryIO) -> Iterator[bytes]:
+    """Decode grid lines until the blank separator line.
+
+    Args:
+        f: File opened in binary mode, positioned at the first row.
+
+    Yields:
+        One ``bytes`` object per row, one wall bitmask per cell.
+
+    Raises:
+        RuntimeError: If a row has a bad digit or a different width.
+    """
+    width = -1
+    for number, line in enumerate(f, start=1):
+        row = line.rstrip(b"\r\n").translate(_DECODE_TABLE, b" ")
+        if not row:
+            return
+        if width < 0:
+            width = len(row)
+        if len(row) != width:
+            raise RuntimeError(
+                f"Row {number} has {len(row)} cells, expected {width}"
+            )
+        if max(row) == _BAD:
+            raise RuntimeError(f"Invalid hex digit in row {number}")
+        yield row
+
+
+def _parse_point(line: bytes, name: str) -> Point:
+    """Parse an 'x,y' line into a tuple of ints.
+
+    Args:
+        line: The raw line, without its newline.
+        name: Field name for error messages.
+
+    Returns:
+        A tuple of (x, y) integers.
+
+    Raises:
+        RuntimeError: If the format is invalid.
+    """
+    try:
+        x, y = line.split(b",")
+        return int(x), int(y)
+    except ValueError as exc:
+        raise RuntimeError(f"Invalid {name} line: {line!r}") from exc
@@ -0,0 +1,114 @@
+"""NumPy-backed maze with vectorized whole-grid operations.
+
+This module requires NumPy and raises ImportError when it is missing.
+"""
+
+from typing import Any, List, Tuple
+
+import numpy as np
+
+from .cell import TOP, RIGHT, BOTTOM, LEFT
+from .maze import MARKED, VISITED, CompactMaze, Maze
+
+
+class NumpyMaze(CompactMaze):
+    """Compact maze exposing its cells as a 2-D ``uint8`` array.
+
+    ``array`` shares memory with the byte buffer used by CompactMaze,
+    so per-cell access keeps the fast bytearray path while bulk
+    operations run as NumPy expressions over the whole grid.
+    """
+
+    def __init__(self, width: int, height: int) -> None:
+        """Initialise a NumPy maze with all walls closed.
+
+        Args:
+            width: Number of columns.
+            height: Number of rows.
+        """
+        super().__init__(width, height)
+        self.array: Any = np.frombuffer(
+            self.data, dtype=np.uint8
+        ).reshape(height, width)
+
+    @classmethod
+    def from_maze(cls, maze: Maze) -> "NumpyMaze":
+        """Copy any Maze, including visited and marked flags.
+
+        Args:
+            maze: The maze to convert.
+
+        Returns:
+            A NumpyMaze with identical cell state.
+        """
+        result = cls(maze.width, maze.height)
+        if isinstance(maze, CompactMaze):
+            result.data[:] = maze.data
+            return result
+        result.array[:] = np.array(
+            [
+                [
+                    cell.walls
+                    | (VISITED if cell.visited else 0)
+                    | (MARKED if cell.marked else 0)
+                    for cell in row
+                ]
+                for row in maze.grid
+            ],
+            dtype=np.uint8,
+        ).reshape(maze.height, maze.width)
+        return result
+
+    def to_maze(self) -> Maze:
+        """Copy the cells into a plain list-of-Cell Maze.
+
+        Returns:
+            A Maze with identical walls, visited and marked flags.
+        """
+        maze = Maze(self.width, self.height)
+        for row, values in zip(maze.grid, self.array.tolist()):
+            for cell, value in zip(row, values):
+                cell.walls = value & 0xF
+                cell.visited = bool(value & VISITED)
+                cell.marked = bool(value & MARKED)
+        return maze
+
+    def close_borders(self) -> None:
+        """Close every wall on the outer edge of the grid."""
+        a = self.array
+        a[0, :] |= TOP
+        a[-1, :] |= BOTTOM
+        a[:, 0] |= LEFT
+        a[:, -1] |= RIGHT
+        self.revision += 1
+
+    def inconsistent_walls(self) -> List[Tuple[int, int, int]]:
+        """Find walls that disagree with the neighbouring cell.
+
+        Returns:
+            (x, y, wall) tuples for every RIGHT or BOTTOM wall of
+            (x, y) whose state differs from the matching LEFT or TOP
+            wall of its neighbour, in row-major order.
+        """
+        a = self.array
+        right = np.zeros(a.shape, dtype=bool)
+        right[:, :-1] = (
+            ((a[:, :-1] & RIGHT) != 0) != ((a[:, 1:] & LEFT) != 0)
+        )
+        bottom = np.zeros(a.shape, dtype=bool)
+        bottom[:-1, :] = (
+            ((a[:-1, :] & BOTTOM) != 0) != ((a[1:, :] & TOP) != 0)
+        )
+        keys = np.flatnonzero(
+            np.stack((right, bottom), axis=-1).reshape(-1)
+        )
+        flat = keys >> 1
+        walls = (RIGHT, BOTTOM)
+        return [
+            (x, y, walls[k])
+            for x, y, k in zip(
+                (flat % self.width).tolist(),
+                (flat // self.width).tolist(),
+                (keys & 1).tolist(),
+            )
+        ]
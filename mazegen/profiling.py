@@ -0,0 +1,211 @@
+"""Opt-in hot-path counters and timing spans.
+
+Instrumentation is off by default.  While disabled, ``span`` returns
+a shared no-op context manager and ``count`` returns at once; the
+instrumented functions keep their tallies in local variables and
+report them once per call, so nothing is added to their inner loops.
+
+.. code-block:: python
+
+    from mazegen import profiling
+
+    profiling.enable()
+    with profiling.span("generate"):
+        gen.generate_imperfect((0, 0))
+    print(profiling.summary())
+    profiling.write_trace("trace.json")  # open in chrome://tracing
+
+Counters recorded by the package:
+
+- ``generate.cells_carved`` — cells carved by the backtracker.
+- ``imperfect.walls_tried`` / ``imperfect.walls_kept`` — wall slots
+  drawn and walls actually removed by ``generate_imperfect``.
+- ``imperfect.open_area_checks`` / ``imperfect.open_area_rejects`` —
+  3x3 open-area checks, and removals they refused.
+- ``imperfect.windows_counted`` — 3x3 windows whose wall counts had
+  to be computed.
+- ``solve.cells_expanded`` — cells taken off the BFS queue.
+"""
+
+import json
+import os
+import threading
+import time
+from contextlib import nullcontext
+from types import TracebackType
+from typing import (
+    ContextManager, Dict, List, Optional, Tuple, Type, Union
+)
+
+ENABLED = False
+
+Event = Dict[str, Union[str, int, float, Dict[str, int]]]
+
+_NULL: ContextManager[None] = nullcontext()
+_lock = threading.Lock()
+_counters: Dict[str, int] = {}
+# (name, start ns, duration ns, thread id) per finished span.
+_spans: List[Tuple[str, int, int, int]] = []
+_origin = time.perf_counter_ns()
+
+
+def enable() -> None:
+    """Start recording counters and spans."""
+    global ENABLED
+    ENABLED = True
+
+
+def disable() -> None:
+    """Stop recording; what was recorded so far is kept."""
+    global ENABLED
+    ENABLED = False
+
+
+def reset() -> None:
+    """Drop every recorded counter and span."""
+    with _lock:
+        _counters.clear()
+        _spans.clear()
+
+
+def count(name: str, n: int = 1) -> None:
+    """Add *n* to a counter.
+
+    Args:
+        name: Counter name, ``"<phase>.<what>"`` by convention.
+        n: Amount to add.
+    """
+    if not ENABLED:
+        return
+    with _lock:
+        _counters[name] = _counters.get(name, 0) + n
+
+
+class _Span:
+    """Context manager recording one complete trace event."""
+
+    def __init__(self, name: str) -> None:
+        """Name the span; timing starts on ``__enter__``.
+
+        Args:
+            name: Span name shown in the trace viewer.
+        """
+        self.name = name
+        self.start = 0
+
+    def __enter__(self) -> None:
+        """Start timing."""
+        self.start = time.perf_counter_ns()
+
+    def __exit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc: Optional[BaseException],
+        tb: Optional[TracebackType],
+    ) -> None:
+        """Record the span, even if the block raised."""
+        duration = time.perf_counter_ns() - self.start
+        with _lock:
+            _spans.append(
+                (self.name, self.start, duration, threading.get_ident())
+            )
+
+
+def span(name: str) -> ContextManager[None]:
+    """Time the enclosed block as a named phase.
+
+    Args:
+        name: Span name shown in the trace viewer.
+
+    Returns:
+        A context manager; a shared no-op one while disabled.
+    """
+    if not ENABLED:
+        return _NULL
+    return _Span(name)
+
+
+def counters() -> Dict[str, int]:
+    """Return a copy of the counters recorded so far."""
+    with _lock:
+        return dict(_counters)
+
+
+def trace_events() -> List[Event]:
+    """Return the recorded spans plus one final event per counter.
+
+    Returns:
+        Events in the Chrome trace event format, spans in the order
+        they finished.
+    """
+    pid = os.getpid()
+    now = (time.perf_counter_ns() - _origin) / 1000
+    with _lock:
+        events: List[Event] = [
+            {
+                "name": name,
+                "ph": "X",
+                "ts": (start - _origin) / 1000,
+                "dur": duration / 1000,
+                "pid": pid,
+                "tid": tid,
+            }
+            for name, start, duration, tid in _spans
+        ]
+        events.extend(
+            {
+                "name": name,
+                "ph": "C",
+                "ts": now,
+                "pid": pid,
+                "tid": 0,
+                "args": {"value": value},
+            }
+            for name, value in sorted(_counters.items())
+        )
+    return events
+
+
+def write_trace(path: str) -> None:
+    """Write the recording as Chrome trace JSON.
+
+    The file opens in ``chrome://tracing`` or https://ui.perfetto.dev.
+
+    Args:
+        path: Output file path.
+
+    Raises:
+        RuntimeError: If the file cannot be written.
+    """
+    try:
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(
+                {
+                    "traceEvents": trace_events(),
+                    "displayTimeUnit": "ms",
+                },
+                f,
+            )
+    except OSError as exc:
+        raise RuntimeError(f"Cannot write trace file: {exc}") from exc
+
+
+def summary() -> str:
+    """Format total time per span name and every counter.
+
+    Returns:
+        One line per span name, then one per counter.
+    """
+    totals: Dict[str, int] = {}
+    calls: Dict[str, int] = {}
+    with _lock:
+        for name, _, duration, _ in _spans:
+            totals[name] = totals.get(name, 0) + duration
+            calls[name] = calls.get(name, 0) + 1
+        counted = sorted(_counters.items())
+    lines = [
+        f"{name:<32} {totals[name] / 1e6:10.2f} ms  x{calls[name]}"
+        for name in sorted(totals, key=totals.__getitem__, reverse=True)
+    ]
+    lines.extend(f"{name:<32} {value:13d}" for name, value in counted)
+    return "\n".join(lines)
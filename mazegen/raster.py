@@ -0,0 +1,249 @@
+"""Raster export of mazes to PPM and PNG (standard library only).
+
+Each cell is a square of ``cell_size`` pixels whose first row and
+column are its top and left walls.  Scanlines are assembled a maze
+row at a time: per-cell codes are computed for the whole row with
+big-integer byte lanes (as in ``bulk``), then mapped to precomputed
+pixel spans and joined, so no Python code runs per pixel.
+"""
+
+import struct
+import zlib
+from typing import BinaryIO, Dict, Iterator, List, Optional, Tuple
+
+from .cell import RIGHT, BOTTOM
+from .maze import MARKED, CompactMaze, Maze
+
+Point = Tuple[int, int]
+Color = Tuple[int, int, int]
+
+BACKGROUND: Color = (255, 255, 255)
+WALL: Color = (0, 0, 0)
+FORTY_TWO: Color = (128, 128, 128)
+PATH: Color = (0, 170, 0)
+ENTRY: Color = (200, 0, 200)
+EXIT: Color = (220, 0, 0)
+
+# Cell fill codes, in the order of _FILLS.
+_EMPTY, _MARKED, _ON_PATH, _ENTRY, _EXIT = range(5)
+_FILLS = (BACKGROUND, FORTY_TWO, PATH, ENTRY, EXIT)
+
+
+def image_size(maze: Maze, cell_size: int = 4) -> Tuple[int, int]:
+    """Return the pixel size of the image of *maze*.
+
+    Args:
+        maze: The Maze to draw.
+        cell_size: Pixels per cell side, walls included.
+
+    Returns:
+        (width, height) in pixels.
+    """
+    return maze.width * cell_size + 1, maze.height * cell_size + 1
+
+
+def scanlines(
+    maze: Maze,
+    entry: Point,
+    exit_pt: Point,
+    solution: Optional[List[Point]] = None,
+    cell_size: int = 4,
+) -> Iterator[bytes]:
+    """Yield the RGB pixel rows of the maze image, top to bottom.
+
+    Args:
+        maze: The Maze to draw.
+        entry: Entry cell coordinates.
+        exit_pt: Exit cell coordinates.
+        solution: Optional path to draw; openings between two
+            consecutive path cells are filled too.
+        cell_size: Pixels per cell side, walls included (>= 2).
+
+    Yields:
+        One ``bytes`` row of ``3 * image width`` per pixel row.
+
+    Raises:
+        ValueError: If *cell_size* is below 2.
+    """
+    if cell_size < 2:
+        raise ValueError("cell_size must be at least 2")
+    width, height = maze.width, maze.height
+    if not width or not height:
+        return
+    inner = cell_size - 1
+    wall = bytes(WALL)
+    ones = int.from_bytes(b"\x01" * width, "little")
+
+    # Interior code: bit 0 left wall, bits 1-3 fill, bit 4 path join.
+    body: Dict[int, bytes] = {}
+    # Wall-row code: bit 0 wall, bit 1 path join.
+    edge: Dict[int, bytes] = {}
+    for code in range(32):
+        fill = (code >> 1) & 7
+        if fill >= len(_FILLS):
+            continue
+        gap = wall if code & 1 else bytes(
+            PATH if code & 16 else BACKGROUND
+        )
+        body[code] = gap + bytes(_FILLS[fill]) * inner
+    for code in range(4):
+        gap = wall if code & 1 else bytes(
+            PATH if code & 2 else BACKGROUND
+        )
+        edge[code] = wall + gap * inner
+
+    walls = maze.wall_bytes().translate(_LOW_NIBBLE)
+    marked = _marked_bytes(maze)
+    on_path: Dict[int, List[int]] = {}
+    for x, y in solution or ():
+        on_path.setdefault(y, []).append(x)
+
+    above = 0
+    for y in range(height):
+        start = y * width
+        row_walls = walls[start:start + width]
+        fills = bytearray(marked[start:start + width])
+        path = bytearray(width)
+        for x in on_path.get(y, ()):
+            fills[x] = _ON_PATH
+            path[x] = 1
+        for (px, py), fill in ((entry, _ENTRY), (exit_pt, _EXIT)):
+            if py == y:
+                fills[px] = fill
+                path[px] = 1 if solution else 0
+        w = int.from_bytes(row_walls, "little")
+        p = int.from_bytes(path, "little")
+        left = (w >> 3) & ones
+        top = w & ones
+        join_left = p & (p << 8) & ~left & ones
+        join_top = p & above & ~top & ones
+        codes = (
+            left
+            | int.from_bytes(fills, "little") << 1
+            | join_left << 4
+        ).to_bytes(width, "little")
+        ceiling = (top | join_top << 1).to_bytes(width, "little")
+
+        yield b"".join(map(edge.__getitem__, ceiling)) + wall
+        right = wall if row_walls[-1] & RIGHT else bytes(BACKGROUND)
+        line = b"".join(map(body.__getitem__, codes)) + right
+        for _ in range(inner):
+            yield line
+        above = p
+        bottom = row_walls
+
+    floor = {
+        code: wall + (wall if code & BOTTOM else bytes(BACKGROUND)) * inner
+        for code in range(16)
+    }
+    yield b"".join(map(floor.__getitem__, bottom)) + wall
+
+
+def write_ppm(
+    maze: Maze,
+    path: str,
+    entry: Point,
+    exit_pt: Point,
+    solution: Optional[List[Point]] = None,
+    cell_size: int = 4,
+) -> None:
+    """Write the maze as a binary PPM (P6) image.
+
+    Args:
+        maze: The Maze to draw.
+        path: Output file path.
+        entry: Entry cell coordinates.
+        exit_pt: Exit cell coordinates.
+        solution: Optional path to draw.
+        cell_size: Pixels per cell side, walls included.
+
+    Raises:
+        RuntimeError: If the file cannot be written.
+    """
+    w, h = image_size(maze, cell_size)
+    lines = scanlines(maze, entry, exit_pt, solution, cell_size)
+    try:
+        with open(path, "wb") as f:
+            f.write(f"P6\n{w} {h}\n255\n".encode("ascii"))
+            f.writelines(lines)
+    except OSError as exc:
+        raise RuntimeError(f"Cannot write image file: {exc}") from exc
+
+
+def write_png(
+    maze: Maze,
+    path: str,
+    entry: Point,
+    exit_pt: Point,
+    solution: Optional[List[Point]] = None,
+    cell_size: int = 4,
+    level: int = 6,
+) -> None:
+    """Write the maze as an 8-bit RGB PNG image.
+
+    Scanlines are compressed as they are produced, so only the
+    compressed image is held in memory.
+
+    Args:
+        maze: The Maze to draw.
+        path: Output file path.
+        entry: Entry cell coordinates.
+        exit_pt: Exit cell coordinates.
+        solution: Optional path to draw.
+        cell_size: Pixels per cell side, walls included.
+        level: zlib compression level (0-9).
+
+    Raises:
+        RuntimeError: If the file cannot be written.
+    """
+    w, h = image_size(maze, cell_size)
+    compressor = zlib.compressobj(level)
+    data: List[bytes] = []
+    for line in scanlines(maze, entry, exit_pt, solution, cell_size):
+        data.append(compressor.compress(b"\x00" + line))
+    data.append(compressor.flush())
+    try:
+        with open(path, "wb") as f:
+            f.write(b"\x89PNG\r\n\x1a\n")
+            _png_chunk(
+                f, b"IHDR", struct.pack(">IIBBBBB", w, h, 8, 2, 0, 0, 0)
+            )
+            _png_chunk(f, b"IDAT", b"".join(data))
+            _png_chunk(f, b"IEND", b"")
+    except OSError as exc:
+        raise RuntimeError(f"Cannot write image file: {exc}") from exc
+
+
+_LOW_NIBBLE = bytes(b & 0xF for b in range(256))
+_MARKED_FLAG = bytes(_MARKED if b & MARKED else _EMPTY for b in range(256))
+
+
+def _marked_bytes(maze: Maze) -> bytes:
+    """Return one fill code per cell: 42-pattern or empty.
+
+    Args:
+        maze: The Maze to read.
+
+    Returns:
+        One byte per cell, row-major.
+    """
+    if isinstance(maze, CompactMaze):
+        return bytes(maze.data).translate(_MARKED_FLAG)
+    return bytes(
+        _MARKED if cell.marked else _EMPTY
+        for row in maze.grid
+        for cell in row
+    )
+
+
+def _png_chunk(f: BinaryIO, kind: bytes, payload: bytes) -> None:
+    """Write one PNG chunk with its length and CRC.
+
+    Args:
+        f: File opened in binary mode.
+        kind: Four-byte chunk type.
+        payload: Chunk data.
+    """
+    f.write(struct.pack(">I", len(payload)))
+    f.write(kind + payload)
+    f.write(struct.pack(">I", zlib.crc32(kind + payload)))
@@ -0,0 +1,249 @@
+"""SVG export of mazes with merged wall runs.
+
+Consecutive collinear walls along a grid line are merged into one
+path segment, so the output grows with the number of wall runs
+rather than with the number of cells.  Runs are found with a regular
+expression over one byte per cell, and the document is streamed to
+the file as it is built.
+"""
+
+import re
+from typing import IO, Iterator, List, Optional, Tuple
+
+from .cell import TOP, BOTTOM, LEFT, RIGHT
+from .maze import MARKED, CompactMaze, Maze
+
+Point = Tuple[int, int]
+
+_RUN = re.compile(b"\x01+")
+_FLUSH = 1 << 16
+
+
+def write_svg(
+    maze: Maze,
+    path: str,
+    entry: Point,
+    exit_pt: Point,
+    solution: Optional[List[Point]] = None,
+    cell_size: int = 10,
+) -> None:
+    """Write the maze as an SVG image.
+
+    Args:
+        maze: The Maze to draw.
+        path: Output file path.
+        entry: Entry cell coordinates.
+        exit_pt: Exit cell coordinates.
+        solution: Optional path, drawn as a single polyline.
+        cell_size: Side of a cell in SVG user units.
+
+    Raises:
+        RuntimeError: If the file cannot be written.
+    """
+    try:
+        with open(path, "w", encoding="ascii") as f:
+            _write(f, svg_parts(maze, entry, exit_pt, solution, cell_size))
+    except OSError as exc:
+        raise RuntimeError(f"Cannot write SVG file: {exc}") from exc
+
+
+def svg_parts(
+    maze: Maze,
+    entry: Point,
+    exit_pt: Point,
+    solution: Optional[List[Point]] = None,
+    cell_size: int = 10,
+) -> Iterator[str]:
+    """Yield the SVG document in pieces.
+
+    Args:
+        maze: The Maze to draw.
+        entry: Entry cell coordinates.
+        exit_pt: Exit cell coordinates.
+        solution: Optional path, drawn as a single polyline.
+        cell_size: Side of a cell in SVG user units.
+
+    Yields:
+        Consecutive fragments of the document.
+    """
+    s = cell_size
+    width, height = maze.width, maze.height
+    pad = max(1, s // 5)
+    yield (
+        '<svg xmlns="http://www.w3.org/2000/svg" '
+        f'viewBox="{-pad} {-pad} {width * s + 2 * pad} '
+        f'{height * s + 2 * pad}" '
+        f'width="{width * s + 2 * pad}" '
+        f'height="{height * s + 2 * pad}">\n'
+        f'<rect x="{-pad}" y="{-pad}" width="{width * s + 2 * pad}" '
+        f'height="{height * s + 2 * pad}" fill="white"/>\n'
+    )
+    if not width or not height:
+        yield "</svg>\n"
+        return
+
+    cells = maze.wall_bytes()
+    marked = _marked_flags(maze)
+    if any(marked):
+        yield '<path fill="grey" d="'
+        for y in range(height):
+            row = marked[y * width:(y + 1) * width]
+            for run in _RUN.finditer(row):
+                yield (
+                    f"M{run.start() * s} {y * s}"
+                    f"h{(run.end() - run.start()) * s}v{s}"
+                    f"h{(run.start() - run.end()) * s}z"
+                )
+        yield '"/>\n'
+
+    for (x, y), color in ((entry, "magenta"), (exit_pt, "red")):
+        yield (
+            f'<rect x="{x * s}" y="{y * s}" width="{s}" height="{s}" '
+            f'fill="{color}"/>\n'
+        )
+
+    if solution:
+        yield (
+            '<polyline fill="none" stroke="green" '
+            f'stroke-width="{max(1, s // 3)}" stroke-linejoin="round" '
+            'points="'
+        )
+        half = s // 2
+        yield " ".join(
+            f"{x * s + half},{y * s + half}" for x, y in _turns(solution)
+        )
+        yield '"/>\n'
+
+    yield (
+        '<path fill="none" stroke="black" '
+        f'stroke-width="{max(1, s // 5)}" stroke-linecap="square" d="'
+    )
+    for y in range(height + 1):
+        flags = _horizontal(cells, width, height, y)
+        for run in _RUN.finditer(flags):
+            yield (
+                f"M{run.start() * s} {y * s}"
+                f"h{(run.end() - run.start()) * s}"
+            )
+    for x in range(width + 1):
+        flags = _vertical(cells, width, x)
+        for run in _RUN.finditer(flags):
+            yield (
+                f"M{x * s} {run.start() * s}"
+                f"v{(run.end() - run.start()) * s}"
+            )
+    yield '"/>\n</svg>\n'
+
+
+_TOP_FLAG = bytes(1 if b & TOP else 0 for b in range(256))
+_BOTTOM_FLAG = bytes(1 if b & BOTTOM else 0 for b in range(256))
+_LEFT_FLAG = bytes(1 if b & LEFT else 0 for b in range(256))
+_RIGHT_FLAG = bytes(1 if b & RIGHT else 0 for b in range(256))
+_MARKED_FLAG = bytes(1 if b & MARKED else 0 for b in range(256))
+
+
+def _horizontal(cells: bytes, width: int, height: int, y: int) -> bytes:
+    """Return one flag per cell for the walls along grid line *y*.
+
+    A wall is drawn if either the cell below has TOP or the cell
+    above has BOTTOM.
+
+    Args:
+        cells: Flat wall buffer from ``Maze.wall_bytes``.
+        width: Number of columns.
+        height: Number of rows.
+        y: Horizontal grid line, 0 to *height*.
+
+    Returns:
+        *width* bytes, 1 where a wall runs.
+    """
+    below = (
+        cells[y * width:(y + 1) * width].translate(_TOP_FLAG)
+        if y < height else bytes(width)
+    )
+    above = (
+        cells[(y - 1) * width:y * width].translate(_BOTTOM_FLAG)
+        if y > 0 else bytes(width)
+    )
+    return _or(below, above)
+
+
+def _vertical(cells: bytes, width: int, x: int) -> bytes:
+    """Return one flag per row for the walls along grid line *x*.
+
+    Args:
+        cells: Flat wall buffer from ``Maze.wall_bytes``.
+        width: Number of columns.
+        x: Vertical grid line, 0 to *width*.
+
+    Returns:
+        One byte per row, 1 where a wall runs.
+    """
+    right = cells[x::width].translate(_LEFT_FLAG) if x < width else b""
+    left = cells[x - 1::width].translate(_RIGHT_FLAG) if x > 0 else b""
+    if not right:
+        return left
+    if not left:
+        return right
+    return _or(right, left)
+
+
+def _or(a: bytes, b: bytes) -> bytes:
+    """Return the bytewise OR of two equal-length 0/1 flag strings."""
+    return (
+        int.from_bytes(a, "little") | int.from_bytes(b, "little")
+    ).to_bytes(len(a), "little")
+
+
+def _marked_flags(maze: Maze) -> bytes:
+    """Return one flag per cell, 1 for cells of the 42 pattern.
+
+    Args:
+        maze: The Maze to read.
+
+    Returns:
+        One byte per cell, row-major.
+    """
+    if isinstance(maze, CompactMaze):
+        return bytes(maze.data).translate(_MARKED_FLAG)
+    return bytes(
+        1 if cell.marked else 0 for row in maze.grid for cell in row
+    )
+
+
+def _turns(solution: List[Point]) -> List[Point]:
+    """Drop the points where the path goes straight on.
+
+    Args:
+        solution: Ordered list of (x, y) points.
+
+    Returns:
+        The first and last points and every turning point.
+    """
+    points = [solution[0]]
+    for i in range(1, len(solution) - 1):
+        (ax, ay), (bx, by), (cx, cy) = solution[i - 1:i + 2]
+        if bx - ax != cx - bx or by - ay != cy - by:
+            points.append(solution[i])
+    if len(solution) > 1:
+        points.append(solution[-1])
+    return points
+
+
+def _write(f: IO[str], parts: Iterator[str]) -> None:
+    """Write fragments to *f* in batches of about 64 KiB.
+
+    Args:
+        f: Text file opened for writing.
+        parts: Document fragments.
+    """
+    batch: List[str] = []
+    size = 0
+    for part in parts:
+        batch.append(part)
+        size += len(part)
+        if size >= _FLUSH:
+            f.write("".join(batch))
+            batch.clear()
+            size = 0
+    f.write("".join(batch))
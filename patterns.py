@@ -1,61 +1,342 @@
-"""Module to stamp the 42 pattern onto a maze."""
+"""Stamp glyphs such as the 42 pattern onto a maze.
 
-from maze import Maze
+A glyph is a small bitmap, given as text rows (``#`` for a filled
+cell, ``.`` or space for an empty one) or as rows of 0/1 values.  It
+is scaled up with the maze, centred, and compiled within its bounding
+box plus a one-cell margin: the runs of glyph cells, and the wall bits
+of the ring of cells bordering the glyph.  Compiled stamps are cached
+per (glyph, width, height, scale); their size follows the glyph, not
+the maze.
 
+Before stamping, the cells left outside the glyph are checked to form
+a single region, found by joining runs of free cells row to row with
+a union-find.  Only the margin window is checked: the glyph never
+covers the margin, and every free cell beyond the window reaches it
+without entering the window.  A placement that would split
+the maze, or cover the entry or exit, is rejected in favour of a
+smaller scale.
+"""
 
-def apply_42_pattern(
+import re
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import List, Optional, Sequence, Tuple, Union
+
+from cell import TOP, RIGHT, BOTTOM, LEFT
+from maze import MARKED, VISITED, CompactMaze, Maze
+
+Glyph = Tuple[bytes, ...]
+GlyphSource = Union[str, Sequence[str], Sequence[Sequence[int]]]
+
+FORTY_TWO = (
+    "#...###",
+    "#.....#",
+    "###.###",
+    "..#.#..",
+    "..#.###",
+)
+# Glyphs are scaled to span at most 1/SCALE_DIVISOR of the maze.
+SCALE_DIVISOR = 3
+
+_EMPTY_CHARS = " .0"
+_RUN = re.compile(b"\x00+")
+_SET = re.compile(b"[^\x00]+")
+_FILL = bytes(b | 0xF | VISITED | MARKED for b in range(256))
+
+
+@dataclass(frozen=True)
+class Stamp:
+    """A glyph compiled for one maze size and scale.
+
+    Everything is local to the window made of the glyph's bounding
+    box plus a one-cell margin, clipped to the maze.
+
+    Attributes:
+        scale: Cells per glyph pixel along each axis.
+        window: (left, top, width, height) of the window in the maze.
+        cells: One byte per window cell, 1 where the glyph is.
+        runs: (start, end) flat maze index ranges of glyph cells.
+        ring: Per window row with free cells next to the glyph, the
+            flat maze index of the first one and the wall bits to OR
+            into the cells from there to the last one.
+        connected: Whether the cells outside the glyph form a single
+            region.
+    """
+
+    scale: int
+    window: Tuple[int, int, int, int]
+    cells: bytes
+    runs: Tuple[Tuple[int, int], ...]
+    ring: Tuple[Tuple[int, bytes], ...]
+    connected: bool
+
+    def covers(self, point: Tuple[int, int]) -> bool:
+        """Return whether the glyph covers a maze cell.
+
+        Args:
+            point: (x, y) maze coordinates.
+
+        Returns:
+            True if the cell is part of the glyph.
+        """
+        left, top, width, height = self.window
+        x, y = point[0] - left, point[1] - top
+        return 0 <= x < width and 0 <= y < height and bool(
+            self.cells[y * width + x]
+        )
+
+
+def to_glyph(source: GlyphSource) -> Glyph:
+    """Normalise a text or bitmap glyph.
+
+    Args:
+        source: A multi-line string, a sequence of text rows, or a
+            sequence of rows of 0/1 values.  In text, any character
+            other than space, ``.`` or ``0`` fills its cell.
+
+    Returns:
+        Rows of 0/1 bytes, padded to the same width.
+
+    Raises:
+        ValueError: If the glyph has no filled cell.
+    """
+    lines = source.splitlines() if isinstance(source, str) else source
+    rows: List[bytes] = []
+    for line in lines:
+        if isinstance(line, str):
+            rows.append(bytes(c not in _EMPTY_CHARS for c in line))
+        else:
+            rows.append(bytes(bool(v) for v in line))
+    width = max((len(row) for row in rows), default=0)
+    if not any(any(row) for row in rows):
+        raise ValueError("Glyph has no filled cell")
+    return tuple(row.ljust(width, b"\x00") for row in rows)
+
+
+def auto_scale(glyph: Glyph, width: int, height: int) -> int:
+    """Return the default scale of *glyph* for a maze size.
+
+    Args:
+        glyph: Normalised glyph.
+        width: Maze width.
+        height: Maze height.
+
+    Returns:
+        The largest scale keeping the glyph within
+        1/``SCALE_DIVISOR`` of the maze, and at least 1.
+    """
+    return max(1, min(
+        width // (len(glyph[0]) * SCALE_DIVISOR),
+        height // (len(glyph) * SCALE_DIVISOR),
+    ))
+
+
+@lru_cache(maxsize=8)
+def compile_glyph(
+    glyph: Glyph, width: int, height: int, scale: int
+) -> Optional[Stamp]:
+    """Scale and centre *glyph* on a maze of the given size.
+
+    Args:
+        glyph: Normalised glyph.
+        width: Maze width.
+        height: Maze height.
+        scale: Cells per glyph pixel.
+
+    Returns:
+        The compiled stamp, or None if the scaled glyph does not fit.
+    """
+    glyph_w, glyph_h = len(glyph[0]) * scale, len(glyph) * scale
+    left = width // 2 - glyph_w // 2
+    top = height // 2 - glyph_h // 2
+    if left < 0 or top < 0 or glyph_w > width or glyph_h > height:
+        return None
+
+    win_x, win_y = max(0, left - 1), max(0, top - 1)
+    win_w = min(width, left + glyph_w + 1) - win_x
+    win_h = min(height, top + glyph_h + 1) - win_y
+    local = bytearray(win_w * win_h)
+    for gy, row in enumerate(glyph):
+        line = bytes(row[x // scale] for x in range(glyph_w))
+        for y in range(top + gy * scale, top + (gy + 1) * scale):
+            start = (y - win_y) * win_w + left - win_x
+            local[start:start + glyph_w] = line
+    cells = bytes(local)
+
+    runs: List[Tuple[int, int]] = []
+    ring: List[Tuple[int, bytes]] = []
+    lanes = (1 << 8 * win_w) - 1
+    above, here = 0, int.from_bytes(cells[:win_w], "little")
+    for y in range(win_h):
+        offset = (win_y + y) * width + win_x - y * win_w
+        runs.extend(
+            (offset + run.start(), offset + run.end())
+            for run in _SET.finditer(cells, y * win_w, (y + 1) * win_w)
+        )
+        below = int.from_bytes(
+            cells[(y + 1) * win_w:(y + 2) * win_w], "little"
+        )
+        bits = (
+            below * BOTTOM
+            | above * TOP
+            | (here >> 8) * RIGHT
+            | ((here << 8) & lanes) * LEFT
+        ) & ~(here * 0xFF)
+        if bits:
+            span = bits.to_bytes(win_w, "little")
+            start = win_w - len(span.lstrip(b"\x00"))
+            ring.append((
+                offset + y * win_w + start,
+                span[start:len(span.rstrip(b"\x00"))],
+            ))
+        above, here = here, below
+
+    return Stamp(
+        scale,
+        (win_x, win_y, win_w, win_h),
+        cells,
+        tuple(runs),
+        tuple(ring),
+        _connected(cells, win_w, win_h),
+    )
+
+
+def _connected(cells: bytes, width: int, height: int) -> bool:
+    """Check that the cells outside a glyph form one region.
+
+    Each row is split into runs of free cells; runs overlapping in
+    consecutive rows are joined with a union-find.  The work grows
+    with the number of runs, not cells.
+
+    Args:
+        cells: One byte per cell, 1 where the glyph is.
+        width: Number of columns.
+        height: Number of rows.
+
+    Returns:
+        True if every free cell can reach every other one.
+    """
+    parent: List[int] = []
+
+    def find(i: int) -> int:
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    above: List[Tuple[int, int, int]] = []
+    for y in range(height):
+        base = y * width
+        runs = []
+        for run in _RUN.finditer(cells, base, base + width):
+            runs.append((run.start() - base, run.end() - base, len(parent)))
+            parent.append(len(parent))
+        i = j = 0
+        while i < len(above) and j < len(runs):
+            a_start, a_end, a = above[i]
+            b_start, b_end, b = runs[j]
+            if a_start < b_end and b_start < a_end:
+                parent[find(a)] = find(b)
+            if a_end < b_end:
+                i += 1
+            else:
+                j += 1
+        above = runs
+    return len({find(i) for i in range(len(parent))}) <= 1
+
+
+def _stamp(maze: Maze, stamp: Stamp) -> None:
+    """Close the glyph cells of *maze* and the walls facing them.
+
+    Only the cells listed in the stamp are touched.
+
+    Args:
+        maze: The maze to update.
+        stamp: A stamp compiled for the maze's size.
+    """
+    if isinstance(maze, CompactMaze):
+        data = maze.data
+        for start, end in stamp.runs:
+            data[start:end] = data[start:end].translate(_FILL)
+        for start, bits in stamp.ring:
+            end = start + len(bits)
+            data[start:end] = (
+                int.from_bytes(data[start:end], "little")
+                | int.from_bytes(bits, "little")
+            ).to_bytes(len(bits), "little")
+    else:
+        width = maze.width
+        for start, end in stamp.runs:
+            for i in range(start, end):
+                cell = maze.cell(i % width, i // width)
+                cell.walls = 0xF
+                cell.visited = cell.marked = True
+        for start, bits in stamp.ring:
+            for i, wall in enumerate(bits, start):
+                maze.cell(i % width, i // width).walls |= wall
+    maze.revision += 1
+
+
+def apply_pattern(
     maze: Maze,
     entry: tuple[int, int],
     exit_pt: tuple[int, int],
-) -> None:
-    """Close all walls of cells forming a '42' pattern.
+    glyph: GlyphSource,
+    scale: Optional[int] = None,
+) -> int:
+    """Close all walls of the cells covered by a glyph.
+
+    The glyph is centred on the maze.  Without an explicit *scale*,
+    the largest ``auto_scale`` placement that fits, leaves ENTRY and
+    EXIT free and keeps the rest of the maze in one region is used,
+    trying smaller scales down to 1.
 
     Args:
         maze: The Maze instance to stamp on.
         entry: Entry coordinates.
         exit_pt: Exit coordinates.
+        glyph: Text or bitmap glyph (see ``to_glyph``).
+        scale: Cells per glyph pixel; None to choose automatically.
+
+    Returns:
+        The scale used.
 
     Raises:
-        RuntimeError: If entry or exit overlaps the pattern.
+        RuntimeError: If no placement is valid.
     """
-    cx = maze.width // 2 - 3
-    cy = maze.height // 2 - 2
-
-    pattern = [
-        (0, 0), (0, 1), (0, 2),
-        (1, 2),
-        (2, 2), (2, 3), (2, 4),
+    shape = to_glyph(glyph)
+    width, height = maze.width, maze.height
+    first = scale or auto_scale(shape, width, height)
+    reason = "Maze too small for the pattern."
+    for s in range(first, 0 if scale is None else first - 1, -1):
+        stamp = compile_glyph(shape, width, height, s)
+        if stamp is None:
+            reason = "Maze too small for the pattern."
+        elif stamp.covers(entry):
+            reason = f"ENTRY {entry} lies inside the pattern."
+        elif stamp.covers(exit_pt):
+            reason = f"EXIT {exit_pt} lies inside the pattern."
+        elif not stamp.connected:
+            reason = "The pattern would split the maze in parts."
+        else:
+            _stamp(maze, stamp)
+            return s
+    raise RuntimeError(reason)
 
-        (4, 0), (5, 0), (6, 0),
-        (6, 1), (6, 2),
-        (4, 2), (5, 2),
-        (4, 3), (4, 4),
-        (5, 4), (6, 4),
-    ]
 
-    pattern_cells = {(cx + dx, cy + dy) for dx, dy in pattern}
-
-    if entry in pattern_cells:
-        raise RuntimeError(
-            f"ENTRY {entry} lies inside the 42 pattern."
-        )
+def apply_42_pattern(
+    maze: Maze,
+    entry: tuple[int, int],
+    exit_pt: tuple[int, int],
+) -> None:
+    """Close all walls of cells forming a '42' pattern.
 
-    if exit_pt in pattern_cells:
-        raise RuntimeError(
-            f"EXIT {exit_pt} lies inside the 42 pattern."
-        )
+    Args:
+        maze: The Maze instance to stamp on.
+        entry: Entry coordinates.
+        exit_pt: Exit coordinates.
 
-    for x, y in pattern_cells:
-        if maze.inside(x, y):
-            cell = maze.cell(x, y)
-            cell.walls = 0xF
-            cell.visited = True
-            cell.marked = True
-            if y > 0 and maze.inside(x, y - 1):
-                maze.add_wall(x, y - 1, 0x4)
-            if y < maze.height - 1 and maze.inside(x, y + 1):
-                maze.add_wall(x, y + 1, 0x1)
-            if x > 0 and maze.inside(x - 1, y):
-                maze.add_wall(x - 1, y, 0x2)
-            if x < maze.width - 1 and maze.inside(x + 1, y):
-                maze.add_wall(x + 1, y, 0x8)
+    Raises:
+        RuntimeError: If entry or exit overlaps the pattern.
+    """
+    apply_pattern(maze, entry, exit_pt, FORTY_TWO)
@@ -0,0 +1,98 @@
+"""Speculative generation of the next maze for the interactive loop."""
+
+import threading
+from typing import List, Optional, Tuple, cast
+
+from batch import build_maze
+from config import ConfigDict
+from maze import Maze
+
+Point = Tuple[int, int]
+
+
+class MazePrefetcher:
+    """Build the next maze on a background thread.
+
+    While the current maze is on screen and the main thread waits
+    for input, the next one is generated and solved, so "Re-generate"
+    only has to pick it up.  Each maze is built by ``build_maze`` with
+    the configured seed, exactly as it would be synchronously.
+
+    The worker is a daemon thread: quitting never waits for a
+    generation in progress.  ``close`` sets the worker's cancel event,
+    which ``build_maze`` checks between stages, so an abandoned worker
+    stops after the stage it is in rather than finishing the maze.
+    """
+
+    def __init__(self, config: ConfigDict, seed: Optional[int]) -> None:
+        """Start building the first maze.
+
+        Args:
+            config: Parsed configuration from ``read_config``.
+            seed: RNG seed, or None for random mazes.
+        """
+        self.config = config
+        self.seed = seed
+        self._closed = False
+        self._result: Optional[Tuple[Maze, List[Point]]] = None
+        self._error: Optional[BaseException] = None
+        self._thread: Optional[threading.Thread] = None
+        self._cancel = threading.Event()
+        self._start()
+
+    def _start(self) -> None:
+        """Launch a worker for the next maze."""
+        self._result = None
+        self._error = None
+        self._cancel = threading.Event()
+        self._thread = threading.Thread(
+            target=self._work, args=(self._cancel,), daemon=True
+        )
+        self._thread.start()
+
+    def _work(self, cancel: threading.Event) -> None:
+        """Worker body: build one maze and keep the result or error.
+
+        Args:
+            cancel: Event that stops this worker's build between stages.
+        """
+        try:
+            self._result = build_maze(self.config, self.seed, cancel)
+        except BaseException as exc:
+            self._error = exc
+
+    def take(self) -> Tuple[Maze, List[Point]]:
+        """Return the next maze, waiting for it if still in progress.
+
+        A worker for the following maze is started before returning;
+        after an error the prefetcher is closed.
+
+        Returns:
+            The maze and its shortest path from ENTRY to EXIT.
+
+        Raises:
+            RuntimeError: If the prefetcher is closed, or whatever
+                ``build_maze`` raised for this maze.
+        """
+        if self._closed or self._thread is None:
+            raise RuntimeError("Maze prefetcher is closed")
+        self._thread.join()
+        if self._error is not None:
+            self.close()
+            raise self._error
+        result = cast(Tuple[Maze, List[Point]], self._result)
+        self._start()
+        return result
+
+    def close(self) -> None:
+        """Stop prefetching and cancel the running worker.
+
+        The call does not wait: the daemon worker notices the
+        cancellation at its next stage boundary and exits, and any
+        result or error it leaves behind is discarded.  A stage that is
+        already running (generation of a very large maze, say) still
+        runs to completion on that thread.
+        """
+        self._closed = True
+        self._cancel.set()
+        self._thread = None
@@ -0,0 +1,150 @@
+"""Read maze files back from disk."""
+
+import mmap
+from typing import Optional, Tuple
+
+from writer import FLAG_PERFECT, FLAG_SOLUTION, PACKED_HEADER, PACKED_MAGIC
+
+Point = Tuple[int, int]
+
+_LOW = bytes(b & 0xF for b in range(256))
+_HIGH = bytes(b >> 4 for b in range(256))
+_STEP_LETTER = bytes.maketrans(b"\x00\x01\x02\x03", b"NESW")
+_STEP_LANES = [bytes((b >> s) & 3 for b in range(256)) for s in (0, 2, 4, 6)]
+
+
+class PackedMazeFile:
+    """Memory-mapped view of a packed binary maze file.
+
+    Only the header is parsed on open; cells and solution steps are
+    decoded from the mapping on demand, so probing a 100M-cell maze
+    touches just the pages it reads.
+    """
+
+    def __init__(self, path: str) -> None:
+        """Map *path* and parse its header.
+
+        Args:
+            path: File written by ``writer.write_packed_maze``.
+
+        Raises:
+            RuntimeError: If the file cannot be read or is not a
+                valid packed maze.
+        """
+        self._map: Optional[mmap.mmap] = None
+        try:
+            with open(path, "rb") as f:
+                self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError) as exc:
+            raise RuntimeError(f"Cannot read maze file: {exc}") from exc
+
+        if len(self._map) < PACKED_HEADER.size:
+            self.close()
+            raise RuntimeError("Truncated maze file header")
+        (
+            magic, self.width, self.height,
+            ex, ey, xx, xy, self.flags, self.steps,
+        ) = PACKED_HEADER.unpack_from(self._map)
+        if magic != PACKED_MAGIC:
+            self.close()
+            raise RuntimeError("Not a packed maze file")
+        self.entry: Point = (ex, ey)
+        self.exit: Point = (xx, xy)
+
+        self._cells = PACKED_HEADER.size
+        self._solution = self._cells + (self.width * self.height + 1) // 2
+        if len(self._map) < self._solution + (self.steps + 3) // 4:
+            self.close()
+            raise RuntimeError("Truncated maze file")
+
+    @property
+    def perfect(self) -> bool:
+        """Whether the file was flagged as a perfect maze."""
+        return bool(self.flags & FLAG_PERFECT)
+
+    @property
+    def has_solution(self) -> bool:
+        """Whether the file stores a solution path."""
+        return bool(self.flags & FLAG_SOLUTION)
+
+    def _data(self) -> mmap.mmap:
+        """Return the open mapping.
+
+        Raises:
+            RuntimeError: If the file has been closed.
+        """
+        if self._map is None:
+            raise RuntimeError("Maze file is closed")
+        return self._map
+
+    def walls(self, x: int, y: int) -> int:
+        """Return the wall bitmask of one cell.
+
+        Args:
+            x: Column index.
+            y: Row index.
+
+        Returns:
+            The cell's walls (TOP=1, RIGHT=2, BOTTOM=4, LEFT=8).
+
+        Raises:
+            IndexError: If (x, y) is outside the maze.
+        """
+        if not (0 <= x < self.width and 0 <= y < self.height):
+            raise IndexError(f"Cell ({x}, {y}) out of range")
+        i = y * self.width + x
+        byte: int = self._data()[self._cells + i // 2]
+        return byte >> 4 if i & 1 else byte & 0xF
+
+    def row(self, y: int) -> bytes:
+        """Return the wall bitmasks of one row.
+
+        Args:
+            y: Row index.
+
+        Returns:
+            One byte per cell of the row.
+
+        Raises:
+            IndexError: If *y* is outside the maze.
+        """
+        if not 0 <= y < self.height:
+            raise IndexError(f"Row {y} out of range")
+        start = y * self.width
+        end = start + self.width
+        packed = self._data()[
+            self._cells + start // 2:self._cells + (end + 1) // 2
+        ]
+        cells = bytearray(2 * len(packed))
+        cells[0::2] = packed.translate(_LOW)
+        cells[1::2] = packed.translate(_HIGH)
+        offset = start & 1
+        return bytes(cells[offset:offset + self.width])
+
+    def directions(self) -> str:
+        """Decode the stored solution.
+
+        Returns:
+            The solution as N, E, S, W characters (empty if none).
+        """
+        packed = self._data()[
+            self._solution:self._solution + (self.steps + 3) // 4
+        ]
+        codes = bytearray(4 * len(packed))
+        for lane, table in enumerate(_STEP_LANES):
+            codes[lane::4] = packed.translate(table)
+        return codes[:self.steps].translate(_STEP_LETTER).decode("ascii")
+
+    def close(self) -> None:
+        """Unmap the file."""
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+
+    def __enter__(self) -> "PackedMazeFile":
+        """Return self for use in a ``with`` block."""
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        """Unmap the file on leaving a ``with`` block."""
+        self.close()
@@ -1,11 +1,15 @@
 """Terminal-based ASCII maze renderer."""
 
-from typing import Iterable, Tuple
+import shutil
+import sys
+from operator import add
+from typing import Dict, Iterable, List, Set, Tuple
 
 from maze import Maze
-from cell import RIGHT, BOTTOM
+from cell import TOP, RIGHT, BOTTOM, LEFT
 
 Point = Tuple[int, int]
+Window = Tuple[int, int, int, int]
 
 
 class Colors:
@@ -19,12 +23,61 @@ class Colors:
     RESET = "\033[0m"
 
 
+HOME = "\033[H"
+CLEAR_LINE = "\033[K"
+CLEAR_BELOW = "\033[J"
+
+# Stands for the current wall colour in cached templates.
+_WALL = "\0"
+_BAR = _WALL + "|" + Colors.RESET
+_CORNER = _WALL + "+" + Colors.RESET
+_RIGHT = [_BAR if walls & RIGHT else " " for walls in range(16)]
+_BOTTOM = [
+    _WALL + "---" + Colors.RESET + _CORNER if walls & BOTTOM
+    else "   " + _CORNER
+    for walls in range(16)
+]
+_LEFT = [_BAR if walls & LEFT else " " for walls in range(16)]
+_CEILING = [
+    _WALL + "---" + Colors.RESET + _CORNER if walls & TOP
+    else "   " + _CORNER
+    for walls in range(16)
+]
+_BLANK = "   "
+_MARKED = Colors.FORTY_TWO + "███" + Colors.RESET
+_ON_PATH = Colors.PATH + " · " + Colors.RESET
+_ENTRY = Colors.ENTRY + " E " + Colors.RESET
+_EXIT = Colors.EXIT + " X " + Colors.RESET
+
+
 class MazeRenderer:
-    """Render a maze in the terminal with colours."""
+    """Render a maze in the terminal with colours.
+
+    Rows are built from segments precomputed once, with a placeholder
+    for the wall colour, and a frame is written with one
+    ``sys.stdout.write`` call.  ``repaint`` draws only the window of
+    cells that fits the terminal and keeps the templates of the frame
+    on screen, so toggling the path or changing colour does not
+    rebuild the drawing.
+    """
+
+    # Terminal lines kept free below the maze for the menu.
+    RESERVED_LINES = 10
 
     def __init__(self) -> None:
-        """Set the default wall colour."""
+        """Set the default wall colour and view."""
         self.wall_color = Colors.WALL
+        self.origin: Point = (0, 0)
+        self._maze: Maze | None = None
+        self._scene: Tuple[int, Point, Point, Window] = (
+            -1, (0, 0), (0, 0), (0, 0, 0, 0),
+        )
+        self._path_src: Iterable[Point] | None = None
+        self._path_rows: Dict[int, List[int]] = {}
+        self._path: Set[Point] = set()
+        self._tops: List[str] = []
+        self._floors: List[str] = []
+        self._dirty: Set[int] = set()
 
     def cycle_wall_color(self) -> None:
         """Rotate to the next wall colour.
@@ -41,6 +94,207 @@ class MazeRenderer:
             (idx + 1) % len(colors)
         ]
 
+    def view_size(self) -> Tuple[int, int]:
+        """Return how many cells fit the terminal.
+
+        Returns:
+            (columns, rows) of cells, leaving ``RESERVED_LINES``
+            lines free for the menu.
+        """
+        size = shutil.get_terminal_size()
+        return (
+            max(1, (size.columns - 1) // 4),
+            max(1, (size.lines - self.RESERVED_LINES - 1) // 2),
+        )
+
+    def pan(self, dx: int, dy: int) -> None:
+        """Move the view by (dx, dy) cells.
+
+        The view is clamped to the maze on the next repaint.
+
+        Args:
+            dx: Columns to move right (negative for left).
+            dy: Rows to move down (negative for up).
+        """
+        self.origin = (self.origin[0] + dx, self.origin[1] + dy)
+
+    def center(self, point: Point) -> None:
+        """Move the view so that *point* is in its middle.
+
+        Args:
+            point: Cell coordinates to centre on.
+        """
+        cols, rows = self.view_size()
+        self.origin = (point[0] - cols // 2, point[1] - rows // 2)
+
+    def _window(self, maze: Maze) -> Window:
+        """Clamp the view to the maze and return it.
+
+        Args:
+            maze: The Maze to render.
+
+        Returns:
+            (x0, y0, columns, rows) of the cells in view.
+        """
+        cols, rows = self.view_size()
+        cols, rows = min(cols, maze.width), min(rows, maze.height)
+        x0 = min(max(self.origin[0], 0), maze.width - cols)
+        y0 = min(max(self.origin[1], 0), maze.height - rows)
+        self.origin = (x0, y0)
+        return x0, y0, cols, rows
+
+    def _top(
+        self,
+        maze: Maze,
+        y: int,
+        entry: Point,
+        exit_: Point,
+        path_xs: Iterable[int],
+        window: Window,
+    ) -> str:
+        """Build the template of the line holding the bodies of row *y*.
+
+        Args:
+            maze: The Maze to render.
+            y: Row index.
+            entry: Entry cell coordinates.
+            exit_: Exit cell coordinates.
+            path_xs: Columns of the path cells on this row.
+            window: (x0, y0, columns, rows) of the cells drawn.
+
+        Returns:
+            The line, with the wall colour left as a placeholder.
+        """
+        x0, _, cols, _ = window
+        row = maze.grid[y][x0:x0 + cols]
+        bodies = [_MARKED if cell.marked else _BLANK for cell in row]
+        for x in path_xs:
+            if x0 <= x < x0 + cols:
+                bodies[x - x0] = _ON_PATH
+        if entry[1] == y and x0 <= entry[0] < x0 + cols:
+            bodies[entry[0] - x0] = _ENTRY
+        if exit_[1] == y and x0 <= exit_[0] < x0 + cols:
+            bodies[exit_[0] - x0] = _EXIT
+        walls = [cell.walls for cell in row]
+        left = _BAR if x0 == 0 else _LEFT[walls[0]]
+        return left + "".join(
+            map(add, bodies, map(_RIGHT.__getitem__, walls))
+        )
+
+    def _build(
+        self,
+        maze: Maze,
+        entry: Point,
+        exit_: Point,
+        on_path: Dict[int, List[int]],
+        window: Window,
+    ) -> Tuple[List[str], List[str]]:
+        """Build the body and floor line templates of every row in view.
+
+        Args:
+            maze: The Maze to render.
+            entry: Entry cell coordinates.
+            exit_: Exit cell coordinates.
+            on_path: Row index -> columns of the path cells.
+            window: (x0, y0, columns, rows) of the cells drawn.
+
+        Returns:
+            (body lines, floor lines), one of each per row.
+        """
+        x0, y0, cols, rows = window
+        tops = [
+            self._top(maze, y, entry, exit_, on_path.get(y, ()), window)
+            for y in range(y0, y0 + rows)
+        ]
+        floors = [
+            _CORNER + "".join(
+                map(
+                    _BOTTOM.__getitem__,
+                    [cell.walls for cell in maze.grid[y][x0:x0 + cols]],
+                )
+            )
+            for y in range(y0, y0 + rows)
+        ]
+        return tops, floors
+
+    def _ceiling(self, maze: Maze, window: Window) -> str:
+        """Build the template of the line above the first row in view.
+
+        Args:
+            maze: The Maze to render.
+            window: (x0, y0, columns, rows) of the cells drawn.
+
+        Returns:
+            The outer border, or the top walls of the first row
+            when the view does not start at the top of the maze.
+        """
+        x0, y0, cols, _ = window
+        if y0 == 0:
+            return _WALL + "+" + "---+" * cols + Colors.RESET
+        return _CORNER + "".join(
+            map(
+                _CEILING.__getitem__,
+                [cell.walls for cell in maze.grid[y0][x0:x0 + cols]],
+            )
+        )
+
+    def _assemble(
+        self,
+        ceiling: str,
+        tops: List[str],
+        floors: List[str],
+        line_end: str,
+    ) -> str:
+        """Join row templates into a frame in the current colour.
+
+        Args:
+            ceiling: Template of the line above the first row.
+            tops: Body line templates.
+            floors: Floor line templates.
+            line_end: Terminator appended to every line.
+
+        Returns:
+            The frame, one terminated line per text row.
+        """
+        lines = [ceiling]
+        for top, floor in zip(tops, floors):
+            lines.append(top)
+            lines.append(floor)
+        lines.append("")
+        return line_end.join(lines).replace(_WALL, self.wall_color)
+
+    def frame(
+        self,
+        maze: Maze,
+        entry: Point,
+        exit_: Point,
+        path: Iterable[Point] | None = None,
+        line_end: str = "\n",
+        window: Window | None = None,
+    ) -> str:
+        """Assemble the maze drawing as one string.
+
+        Args:
+            maze: The Maze to render.
+            entry: Entry cell coordinates.
+            exit_: Exit cell coordinates.
+            path: Optional path to highlight.
+            line_end: Terminator appended to every line.
+            window: Optional (x0, y0, columns, rows) of the cells to
+                draw; the whole maze by default.
+
+        Returns:
+            The frame, one terminated line per text row.
+        """
+        if window is None:
+            window = (0, 0, maze.width, maze.height)
+        tops, floors = self._build(
+            maze, entry, exit_, _by_row(path), window
+        )
+        return self._assemble(
+            self._ceiling(maze, window), tops, floors, line_end
+        )
+
     def render(
         self,
         maze: Maze,
@@ -48,7 +302,7 @@ class MazeRenderer:
         exit_: Point,
         path: Iterable[Point] | None = None,
     ) -> None:
-        """Print the maze to stdout.
+        """Print the whole maze to stdout.
 
         Args:
             maze: The Maze to render.
@@ -56,46 +310,126 @@ class MazeRenderer:
             exit_: Exit cell coordinates.
             path: Optional path to highlight.
         """
-        path_set = set(path) if path else set()
-
-        wc = self.wall_color
-        rst = Colors.RESET
-        print(wc + "+" + ("---+" * maze.width) + rst)
-
-        for y in range(maze.height):
-            top = wc + "|" + rst
-            bottom = wc + "+" + rst
-
-            for x in range(maze.width):
-                cell = maze.cell(x, y)
-
-                if (x, y) == entry:
-                    body = Colors.ENTRY + " E " + rst
-                elif (x, y) == exit_:
-                    body = Colors.EXIT + " X " + rst
-                elif (x, y) in path_set:
-                    body = Colors.PATH + " · " + rst
-                elif cell.marked:
-                    ft = Colors.FORTY_TWO
-                    body = ft + "███" + rst
-                else:
-                    body = "   "
-                top += body
-
-                top += (
-                    wc + "|" + rst
-                    if cell.walls & RIGHT
-                    else " "
-                )
+        sys.stdout.write(self.frame(maze, entry, exit_, path))
+        sys.stdout.flush()
 
-                has_bottom = cell.walls & BOTTOM
-                wall_seg = (
-                    wc + "---" + rst
-                    if has_bottom
-                    else "   "
-                )
-                corner = wc + "+" + rst
-                bottom += wall_seg + corner
+    def repaint(
+        self,
+        maze: Maze,
+        entry: Point,
+        exit_: Point,
+        path: Iterable[Point] | None = None,
+    ) -> None:
+        """Redraw the cells in view over the previous frame.
+
+        Moves the cursor home and overwrites the screen in place,
+        clearing the rest of each line and everything below the
+        maze, instead of spawning ``clear`` between frames.  Only the
+        window at ``origin`` that fits the terminal is drawn.  When
+        only the highlighted path differs from the frame on screen,
+        just the cells that changed are rewritten; when only the
+        colour differs, the cached row templates are reused.
+
+        Args:
+            maze: The Maze to render.
+            entry: Entry cell coordinates.
+            exit_: Exit cell coordinates.
+            path: Optional path to highlight; pass the same list
+                again to avoid re-indexing it.
+        """
+        if path is not self._path_src or self._maze is not maze:
+            self._path_src = path
+            self._path_rows = _by_row(path)
+        window = self._window(maze)
+        x0, y0, cols, rows = window
+        shown = {
+            (x, y)
+            for y in range(y0, y0 + rows)
+            for x in self._path_rows.get(y, ())
+            if x0 <= x < x0 + cols
+        }
+        scene = (maze.revision, entry, exit_, window)
+        if self._maze is not maze or self._scene != scene:
+            self._tops, self._floors = self._build(
+                maze, entry, exit_, self._path_rows, window
+            )
+            self._maze, self._scene = maze, scene
+            self._dirty.clear()
+            self._path = shown
+            out = self._home()
+        elif shown != self._path:
+            out = self._update_path(maze, shown)
+        else:
+            out = self._home()
+        sys.stdout.write(out + CLEAR_BELOW)
+        sys.stdout.flush()
+
+    def _home(self) -> str:
+        """Return a full frame from the cached templates.
+
+        Rows touched by earlier path updates are rebuilt first.
+
+        Returns:
+            Cursor-home followed by the frame.
+        """
+        _, entry, exit_, window = self._scene
+        maze = self._maze
+        if maze is None:
+            return HOME
+        y0 = window[1]
+        for y in self._dirty:
+            self._tops[y - y0] = self._top(
+                maze, y, entry, exit_, self._path_rows.get(y, ()), window
+            )
+        self._dirty.clear()
+        return HOME + self._assemble(
+            self._ceiling(maze, window),
+            self._tops,
+            self._floors,
+            CLEAR_LINE + "\n",
+        )
+
+    def _update_path(self, maze: Maze, shown: Set[Point]) -> str:
+        """Return cursor-addressed updates for the changed path cells.
+
+        Args:
+            maze: The Maze on screen.
+            shown: Path cells in view to highlight from now on.
+
+        Returns:
+            The updates, leaving the cursor below the maze.
+        """
+        _, entry, exit_, (x0, y0, _, rows) = self._scene
+        parts: List[str] = []
+        for cell in shown ^ self._path:
+            if cell == entry or cell == exit_:
+                continue
+            x, y = cell
+            if cell in shown:
+                body = _ON_PATH
+            elif maze.cell(x, y).marked:
+                body = _MARKED
+            else:
+                body = _BLANK
+            parts.append(
+                f"\033[{2 * (y - y0) + 2};{4 * (x - x0) + 2}H{body}"
+            )
+            self._dirty.add(y)
+        self._path = shown
+        parts.append(f"\033[{2 * rows + 2};1H")
+        return "".join(parts)
+
+
+def _by_row(path: Iterable[Point] | None) -> Dict[int, List[int]]:
+    """Group the cells of a path by row.
+
+    Args:
+        path: Optional list of (x, y) points.
 
-            print(top)
-            print(bottom)
+    Returns:
+        Row index -> columns of the path cells on that row.
+    """
+    rows: Dict[int, List[int]] = {}
+    for x, y in path or ():
+        rows.setdefault(y, []).append(x)
+    return rows
@@ -1,8 +1,11 @@
-"""BFS solver to find the shortest path through a maze."""
+"""Shortest-path solvers: flat BFS, bidirectional BFS, A* and cached
+single-source distance fields."""
 
-from collections import deque
-from typing import Dict, List, Tuple
+import heapq
+from array import array
+from typing import List, Optional, Tuple
 
+import profiling
 from maze import Maze
 from cell import TOP, RIGHT, BOTTOM, LEFT
 
@@ -10,7 +13,7 @@ Point = Tuple[int, int]
 
 
 def shortest_path(
-    maze: Maze, start: Point, end: Point
+    maze: Maze, start: Point, end: Point, method: str = "bfs"
 ) -> List[Point]:
     """Return the shortest path from start to end.
 
@@ -18,45 +21,361 @@ def shortest_path(
         maze: The Maze to solve.
         start: Starting cell coordinates.
         end: Target cell coordinates.
+        method: ``"bfs"``, ``"bidirectional"`` or ``"astar"``.
 
     Returns:
         Ordered list of (x, y) points on the path.
+
+    Raises:
+        ValueError: If *method* is unknown.
     """
-    queue: deque[Point] = deque([start])
-    came_from: Dict[Point, Point | None] = {
-        start: None
-    }
-
-    while queue:
-        x, y = queue.popleft()
-
-        if (x, y) == end:
-            break
-
-        cell = maze.cell(x, y)
-        for dx, dy, wall in (
-            (0, -1, TOP),
-            (1, 0, RIGHT),
-            (0, 1, BOTTOM),
-            (-1, 0, LEFT),
-        ):
-            nx, ny = x + dx, y + dy
-            if not maze.inside(nx, ny):
-                continue
-            if cell.walls & wall:
-                continue
-            if (nx, ny) not in came_from:
-                came_from[(nx, ny)] = (x, y)
-                queue.append((nx, ny))
-
-    if end not in came_from:
-        return []
-
-    path: List[Point] = []
-    cur: Point | None = end
-    while cur:
-        path.append(cur)
-        cur = came_from.get(cur)
-    path.reverse()
+    if method not in _SOLVERS:
+        raise ValueError(
+            f"Unknown method {method!r}; choose from "
+            + ", ".join(sorted(_SOLVERS))
+        )
+    width = maze.width
+    cells = _SOLVERS[method](
+        maze.wall_bytes(),
+        width,
+        maze.height,
+        start[1] * width + start[0],
+        end[1] * width + end[0],
+    )
+    return [(i % width, i // width) for i in cells]
+
+
+class DistanceField:
+    """BFS distances and predecessors from one source cell.
+
+    Built once by ``distance_field`` and then answers distance, path
+    and farthest-cell queries without searching again.
+    """
+
+    def __init__(self, maze: Maze, source: Point) -> None:
+        """Run a full BFS from *source*.
+
+        Args:
+            maze: The Maze to explore.
+            source: Source cell coordinates.
+        """
+        self.source = source
+        self.width = maze.width
+        self.revision = maze.revision
+        size = maze.width * maze.height
+        self.prev = array("l", [-1]) * size
+        self.dist = array("l", [-1]) * size
+
+        walls = maze.wall_bytes()
+        width, prev, dist = maze.width, self.prev, self.dist
+        last_row = (maze.height - 1) * width
+        root = source[1] * width + source[0]
+        prev[root] = root
+        dist[root] = 0
+        order = [root]
+        for i in order:
+            w = walls[i]
+            x = i % width
+            d = dist[i] + 1
+            if not w & TOP and i >= width and prev[i - width] < 0:
+                prev[i - width] = i
+                dist[i - width] = d
+                order.append(i - width)
+            if not w & RIGHT and x < width - 1 and prev[i + 1] < 0:
+                prev[i + 1] = i
+                dist[i + 1] = d
+                order.append(i + 1)
+            if not w & BOTTOM and i < last_row and prev[i + width] < 0:
+                prev[i + width] = i
+                dist[i + width] = d
+                order.append(i + width)
+            if not w & LEFT and x > 0 and prev[i - 1] < 0:
+                prev[i - 1] = i
+                dist[i - 1] = d
+                order.append(i - 1)
+        self.last = order[-1]
+
+    def distance(self, target: Point) -> int:
+        """Return the number of steps from the source to *target*.
+
+        Args:
+            target: Target cell coordinates.
+
+        Returns:
+            The distance, or -1 if *target* is unreachable.
+        """
+        return self.dist[target[1] * self.width + target[0]]
+
+    def path(self, target: Point) -> List[Point]:
+        """Return the shortest path from the source to *target*.
+
+        Args:
+            target: Target cell coordinates.
+
+        Returns:
+            Ordered list of (x, y) points, or an empty list.
+        """
+        end = target[1] * self.width + target[0]
+        if self.prev[end] < 0:
+            return []
+        width = self.width
+        cells = _walk_back(self.prev, end)
+        return [(i % width, i // width) for i in cells]
+
+    def farthest(self) -> Point:
+        """Return a reachable cell at maximal distance from the source.
+
+        Returns:
+            (x, y) of the last cell reached by the BFS.
+        """
+        return (self.last % self.width, self.last // self.width)
+
+
+def distance_field(maze: Maze, source: Point) -> DistanceField:
+    """Return the distance field from *source*, cached on the maze.
+
+    Fields are stored in ``maze.distance_fields`` and dropped as soon
+    as ``maze.revision`` changes, i.e. after any ``add_wall`` or
+    ``remove_wall``.  Each field holds two machine-word arrays of
+    ``width * height`` entries.
+
+    Args:
+        maze: The Maze to explore.
+        source: Source cell coordinates.
+
+    Returns:
+        The DistanceField rooted at *source*.
+    """
+    cache = maze.distance_fields
+    field = cache.get(source)
+    if field is not None and field.revision == maze.revision:
+        return field
+    if any(f.revision != maze.revision for f in cache.values()):
+        cache.clear()
+    field = DistanceField(maze, source)
+    cache[source] = field
+    return field
+
+
+def _neighbours(
+    walls: bytes, width: int, height: int, i: int
+) -> List[int]:
+    """Return the flat indices reachable from cell *i* in one step.
+
+    Args:
+        walls: Flat wall buffer from ``Maze.wall_bytes``.
+        width: Number of columns.
+        height: Number of rows.
+        i: Flat index of the cell.
+
+    Returns:
+        Neighbour indices in TOP, RIGHT, BOTTOM, LEFT order.
+    """
+    w = walls[i]
+    x = i % width
+    out: List[int] = []
+    if not w & TOP and i >= width:
+        out.append(i - width)
+    if not w & RIGHT and x < width - 1:
+        out.append(i + 1)
+    if not w & BOTTOM and i < (height - 1) * width:
+        out.append(i + width)
+    if not w & LEFT and x > 0:
+        out.append(i - 1)
+    return out
+
+
+def _predecessors(
+    walls: bytes, width: int, height: int, i: int
+) -> List[int]:
+    """Return the flat indices that reach cell *i* in one step.
+
+    Same as ``_neighbours`` when walls are consistent, but reads the
+    wall on the neighbour's side, as a forward search would.
+
+    Args:
+        walls: Flat wall buffer from ``Maze.wall_bytes``.
+        width: Number of columns.
+        height: Number of rows.
+        i: Flat index of the cell.
+
+    Returns:
+        Neighbour indices in TOP, RIGHT, BOTTOM, LEFT order.
+    """
+    x = i % width
+    out: List[int] = []
+    if i >= width and not walls[i - width] & BOTTOM:
+        out.append(i - width)
+    if x < width - 1 and not walls[i + 1] & LEFT:
+        out.append(i + 1)
+    if i < (height - 1) * width and not walls[i + width] & TOP:
+        out.append(i + width)
+    if x > 0 and not walls[i - 1] & RIGHT:
+        out.append(i - 1)
+    return out
+
 
+def _walk_back(prev: "array[int]", end: int) -> List[int]:
+    """Follow predecessors from *end* back to the root.
+
+    Args:
+        prev: Predecessor array; the root points to itself.
+        end: Flat index to start from.
+
+    Returns:
+        Flat indices from the root to *end*.
+    """
+    path = [end]
+    while prev[end] != end:
+        end = prev[end]
+        path.append(end)
+    path.reverse()
     return path
+
+
+def _bfs(
+    walls: bytes, width: int, height: int, start: int, end: int
+) -> List[int]:
+    """Breadth-first search over flat cell indices.
+
+    Args:
+        walls: Flat wall buffer from ``Maze.wall_bytes``.
+        width: Number of columns.
+        height: Number of rows.
+        start: Flat index of the start cell.
+        end: Flat index of the target cell.
+
+    Returns:
+        Flat indices on the path, or an empty list.
+    """
+    prev = array("l", [-1]) * (width * height)
+    prev[start] = start
+    order = [start]
+    last_row = (height - 1) * width
+    for expanded, i in enumerate(order, 1):
+        if i == end:
+            profiling.count("solve.cells_expanded", expanded)
+            return _walk_back(prev, end)
+        w = walls[i]
+        x = i % width
+        if not w & TOP and i >= width and prev[i - width] < 0:
+            prev[i - width] = i
+            order.append(i - width)
+        if not w & RIGHT and x < width - 1 and prev[i + 1] < 0:
+            prev[i + 1] = i
+            order.append(i + 1)
+        if not w & BOTTOM and i < last_row and prev[i + width] < 0:
+            prev[i + width] = i
+            order.append(i + width)
+        if not w & LEFT and x > 0 and prev[i - 1] < 0:
+            prev[i - 1] = i
+            order.append(i - 1)
+    profiling.count("solve.cells_expanded", len(order))
+    return []
+
+
+def _bidirectional(
+    walls: bytes, width: int, height: int, start: int, end: int
+) -> List[int]:
+    """Breadth-first search growing from both ends.
+
+    The smaller frontier is expanded one full level at a time; once
+    the searches meet, the level is finished and the shortest
+    meeting point is kept.
+
+    Args:
+        walls: Flat wall buffer from ``Maze.wall_bytes``.
+        width: Number of columns.
+        height: Number of rows.
+        start: Flat index of the start cell.
+        end: Flat index of the target cell.
+
+    Returns:
+        Flat indices on the path, or an empty list.
+    """
+    if start == end:
+        return [start]
+    size = width * height
+    prev = (array("l", [-1]) * size, array("l", [-1]) * size)
+    dist = (array("l", [-1]) * size, array("l", [-1]) * size)
+    frontier = ([start], [end])
+    for side, root in enumerate((start, end)):
+        prev[side][root] = root
+        dist[side][root] = 0
+
+    while frontier[0] and frontier[1]:
+        side = 0 if len(frontier[0]) <= len(frontier[1]) else 1
+        mine, other = prev[side], prev[1 - side]
+        my_dist, other_dist = dist[side], dist[1 - side]
+        best: Optional[Tuple[int, int, int]] = None
+        level: List[int] = []
+        step = _neighbours if side == 0 else _predecessors
+        for i in frontier[side]:
+            for j in step(walls, width, height, i):
+                if other[j] >= 0:
+                    total = my_dist[i] + 1 + other_dist[j]
+                    if best is None or total < best[0]:
+                        best = (total, i, j)
+                if mine[j] < 0:
+                    mine[j] = i
+                    my_dist[j] = my_dist[i] + 1
+                    level.append(j)
+        if best is not None:
+            _, i, j = best
+            head, tail = _walk_back(mine, i), _walk_back(other, j)
+            tail.reverse()
+            path = head + tail
+            if side == 1:
+                path.reverse()
+            return path
+        if side == 0:
+            frontier = (level, frontier[1])
+        else:
+            frontier = (frontier[0], level)
+    return []
+
+
+def _astar(
+    walls: bytes, width: int, height: int, start: int, end: int
+) -> List[int]:
+    """A* search with the Manhattan distance heuristic.
+
+    Args:
+        walls: Flat wall buffer from ``Maze.wall_bytes``.
+        width: Number of columns.
+        height: Number of rows.
+        start: Flat index of the start cell.
+        end: Flat index of the target cell.
+
+    Returns:
+        Flat indices on the path, or an empty list.
+    """
+    size = width * height
+    tx, ty = end % width, end // width
+    prev = array("l", [-1]) * size
+    cost = array("l", [-1]) * size
+    prev[start] = start
+    cost[start] = 0
+    h = abs(start % width - tx) + abs(start // width - ty)
+    heap: List[Tuple[int, int, int, int]] = [(h, h, 0, start)]
+    while heap:
+        _, _, g, i = heapq.heappop(heap)
+        if i == end:
+            return _walk_back(prev, end)
+        if g > cost[i]:
+            continue
+        g += 1
+        for j in _neighbours(walls, width, height, i):
+            if cost[j] < 0 or g < cost[j]:
+                cost[j] = g
+                prev[j] = i
+                h = abs(j % width - tx) + abs(j // width - ty)
+                heapq.heappush(heap, (g + h, h, g, j))
+    return []
+
+
+_SOLVERS = {
+    "bfs": _bfs,
+    "bidirectional": _bidirectional,
+    "astar": _astar,
+}
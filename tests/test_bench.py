@@ -0,0 +1,66 @@
+"""Tests for the benchmark suite: memory budgets and result loading."""
+
+import json
+from pathlib import Path
+
+import pytest
+
+import bench
+
+
+def test_memory_within_budgets() -> None:
+    """Every stage stays within its peak bytes-per-cell budget."""
+    report = bench.memory((500,), (1,), log=lambda msg: None)
+    results = report["results"]
+    assert isinstance(results, dict)
+    assert {key.split("/")[0] for key in results} >= {
+        "maze_init",
+        "apply_42_pattern",
+        "generate_perfect",
+        "shortest_path",
+        "write_hex_maze",
+        "render",
+        "generate_imperfect",
+    }
+    assert bench.over_budget(results, bench.MEMORY_BUDGETS) == []
+
+
+def test_over_budget_flags_stage() -> None:
+    """A stage above its budget is reported; small mazes are skipped."""
+    results = {
+        "render/500x500/seed1": {"peak_per_cell": 200.0},
+        "render/100x100/seed1": {"peak_per_cell": 900.0},
+        "unbudgeted/500x500/seed1": {"peak_per_cell": 900.0},
+    }
+    failures = bench.over_budget(results, {"render": 176})
+    assert len(failures) == 1
+    assert failures[0].startswith("render/500x500/seed1")
+
+
+def test_over_budget_flags_missing_stage() -> None:
+    """A budgeted stage without a result fails instead of passing."""
+    results = {"render/500x500/seed1": {"peak_per_cell": 100.0}}
+    failures = bench.over_budget(
+        results, {"render": 176, "write_hex_maze": 24}
+    )
+    assert failures == ["write_hex_maze/500x500/seed1: not measured"]
+
+
+def test_compare_rejects_memory_report(tmp_path: Path) -> None:
+    """Loading a memory report for ``compare`` is a clean error."""
+    path = tmp_path / "memory.json"
+    path.write_text(json.dumps(
+        {"results": {"render/10x10/seed1": {"peak_bytes": 1}}}
+    ))
+    with pytest.raises(RuntimeError):
+        bench._load(str(path))
+    assert bench.main(["compare", str(path), str(path)]) == 2
+
+
+def test_compare_flags_regression(tmp_path: Path) -> None:
+    """A slowdown above the threshold makes ``compare`` exit 1."""
+    base, new = tmp_path / "base.json", tmp_path / "new.json"
+    base.write_text(json.dumps({"results": {"solve/1x1/seed1": 1.0}}))
+    new.write_text(json.dumps({"results": {"solve/1x1/seed1": 1.5}}))
+    assert bench.main(["compare", str(base), str(base)]) == 0
+    assert bench.main(["compare", str(base), str(new)]) == 1
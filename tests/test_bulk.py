@@ -0,0 +1,99 @@
+"""Tests for the row-vectorized Binary Tree and Sidewinder generators."""
+
+import random
+from typing import Tuple
+
+import pytest
+
+from mazegen import CompactMaze, bulk
+from mazegen.cell import BOTTOM, RIGHT
+
+
+def _carve(
+    width: int, height: int, seed: int, algorithm: str, numpy: bool,
+    monkeypatch: pytest.MonkeyPatch,
+) -> CompactMaze:
+    """Carve a maze with a band of marked cells on the chosen path."""
+    monkeypatch.setattr(bulk, "HAVE_NUMPY", numpy)
+    maze = CompactMaze(width, height)
+    for x in range(width - 1):
+        maze.cell(x, height // 2).marked = True
+    marks = random.Random(seed)
+    for _ in range(width * height // 8):
+        maze.cell(
+            marks.randrange(width), marks.randrange(height)
+        ).marked = True
+    getattr(bulk, algorithm)(maze, random.Random(seed))
+    return maze
+
+
+def _is_spanning_forest(maze: CompactMaze) -> bool:
+    """Check that each region of unmarked cells is carved as one tree."""
+    width, height = maze.width, maze.height
+    parent = list(range(width * height))
+
+    def find(i: int) -> int:
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    free = [
+        not maze.cell(i % width, i // width).marked
+        for i in range(width * height)
+    ]
+    edges = 0
+    for i in range(width * height):
+        x, y = i % width, i // width
+        for wall, j, inside in (
+            (RIGHT, i + 1, x < width - 1),
+            (BOTTOM, i + width, y < height - 1),
+        ):
+            if not (inside and free[i] and free[j]):
+                continue
+            if not maze.cell(x, y).walls & wall:
+                edges += 1
+                parent[find(i)] = find(j)
+    trees = {find(i) for i in range(width * height) if free[i]}
+
+    regions = list(range(width * height))
+
+    def region(i: int) -> int:
+        while regions[i] != i:
+            regions[i] = regions[regions[i]]
+            i = regions[i]
+        return i
+
+    for i in range(width * height):
+        x, y = i % width, i // width
+        if x < width - 1 and free[i] and free[i + 1]:
+            regions[region(i)] = region(i + 1)
+        if y < height - 1 and free[i] and free[i + width]:
+            regions[region(i)] = region(i + width)
+    count = len({region(i) for i in range(width * height) if free[i]})
+    return len(trees) == count and edges == sum(free) - count
+
+
+@pytest.mark.parametrize("algorithm", ["binary_tree", "sidewinder"])
+@pytest.mark.parametrize("size", [(1, 1), (1, 6), (9, 1), (13, 11), (40, 29)])
+def test_pure_python_matches_numpy(
+    algorithm: str, size: Tuple[int, int], monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Both carving paths give the same maze for a seed."""
+    pytest.importorskip("numpy")
+    width, height = size
+    for seed in range(4):
+        fast = _carve(width, height, seed, algorithm, True, monkeypatch)
+        slow = _carve(width, height, seed, algorithm, False, monkeypatch)
+        assert fast.data == slow.data
+
+
+@pytest.mark.parametrize("algorithm", ["binary_tree", "sidewinder"])
+def test_orphans_are_attached(
+    algorithm: str, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Cells cut off by marked cells end up in one tree per region."""
+    for seed in range(4):
+        maze = _carve(31, 23, seed, algorithm, False, monkeypatch)
+        assert _is_spanning_forest(maze)
+        assert maze.inconsistent_walls() == []
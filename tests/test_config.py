@@ -0,0 +1,30 @@
+"""Tests for the option combinations rejected by ``read_config``."""
+
+from pathlib import Path
+
+import pytest
+
+from config import read_config
+
+BASE = (
+    "WIDTH=13\nHEIGHT=11\nENTRY=0,0\nEXIT=12,10\n"
+    "OUTPUT_FILE=out.txt\nPERFECT=True\nSTREAM=True\n"
+)
+
+
+def test_stream_alone_is_accepted(tmp_path: Path) -> None:
+    """A plain streaming config parses with batch mode off."""
+    path = tmp_path / "config.txt"
+    path.write_text(BASE)
+    config = read_config(str(path))
+    assert config["STREAM"] is True
+    assert config["BATCH"] is None
+
+
+@pytest.mark.parametrize("line", ["BATCH=4", "BATCH_DIR=out", "WORKERS=2"])
+def test_stream_rejects_batch_options(tmp_path: Path, line: str) -> None:
+    """Batch settings next to STREAM=True are errors, not ignored."""
+    path = tmp_path / "config.txt"
+    path.write_text(BASE + line + "\n")
+    with pytest.raises(RuntimeError, match=line.split("=")[0]):
+        read_config(str(path))
@@ -0,0 +1,48 @@
+"""Tests for the walls left by ``MazeGenerator.generate_imperfect``."""
+
+from typing import List, Tuple, Type
+
+import pytest
+
+from generator import MazeGenerator
+from maze import CompactMaze, Maze
+from mazegen.cell import BOTTOM, RIGHT
+from patterns import apply_42_pattern
+
+
+def _open_windows(maze: Maze) -> List[Tuple[int, int]]:
+    """List the top-left corners of 3x3 windows with no internal wall."""
+    found: List[Tuple[int, int]] = []
+    for y in range(maze.height - 2):
+        for x in range(maze.width - 2):
+            if not any(
+                maze.cell(x + dx, y + dy).walls & wall
+                for dy in range(3)
+                for dx in range(3)
+                for wall, inside in ((RIGHT, dx < 2), (BOTTOM, dy < 2))
+                if inside
+            ):
+                found.append((x, y))
+    return found
+
+
+@pytest.mark.parametrize("maze_class", [Maze, CompactMaze])
+@pytest.mark.parametrize(
+    "size", [(3, 3), (4, 9), (9, 7), (16, 12), (31, 23), (60, 5)]
+)
+@pytest.mark.parametrize("pattern", [False, True])
+def test_imperfect_has_no_open_area(
+    maze_class: Type[Maze], size: Tuple[int, int], pattern: bool
+) -> None:
+    """Loops never open a 3x3 area, and walls agree on both sides."""
+    width, height = size
+    entry, exit_pt = (0, 0), (width - 1, height - 1)
+    for seed in range(3):
+        maze = maze_class(width, height)
+        if pattern and width >= 9 and height >= 7:
+            apply_42_pattern(maze, entry, exit_pt)
+        generator = MazeGenerator(maze, seed=seed)
+        generator.generate_imperfect(entry)
+        generator.enforce_borders()
+        assert _open_windows(maze) == []
+        assert maze.inconsistent_walls() == []
@@ -0,0 +1,88 @@
+"""Round-trip tests between the hex writer and ``mazegen.loader``."""
+
+from pathlib import Path
+from typing import Type
+
+import pytest
+
+import mazegen
+from eller import eller_rows
+from generator import MazeGenerator
+from maze import CompactMaze, Maze
+from mazegen.loader import iter_hex_rows, load_hex_maze
+from solver import shortest_path
+from writer import write_hex_maze, write_hex_rows
+
+
+@pytest.mark.parametrize("maze_class", [Maze, CompactMaze])
+@pytest.mark.parametrize("compact", [False, True])
+def test_write_then_load(
+    tmp_path: Path, maze_class: Type[Maze], compact: bool
+) -> None:
+    """A written maze loads back with the same walls and solution."""
+    maze = maze_class(23, 17)
+    generator = MazeGenerator(maze, seed=7)
+    generator.generate_imperfect((0, 0))
+    generator.enforce_borders()
+    entry, exit_pt = (0, 0), (22, 16)
+    path = shortest_path(maze, entry, exit_pt)
+    target = str(tmp_path / "maze.txt")
+    write_hex_maze(maze, target, entry, exit_pt, path)
+
+    loaded, l_entry, l_exit, solution = load_hex_maze(target, compact)
+
+    assert isinstance(loaded, mazegen.CompactMaze) == compact
+    assert (loaded.width, loaded.height) == (23, 17)
+    assert loaded.wall_bytes() == bytes(
+        b & 0xF for b in maze.wall_bytes()
+    )
+    assert (l_entry, l_exit) == (entry, exit_pt)
+    assert solution == path
+
+
+def test_write_rows_then_iterate(tmp_path: Path) -> None:
+    """Streamed rows come back unchanged from ``iter_hex_rows``."""
+    rows = list(eller_rows(31, 12, 3))
+    target = str(tmp_path / "stream.txt")
+    write_hex_rows(iter(rows), target, (0, 0), (30, 11))
+
+    assert list(iter_hex_rows(target)) == rows
+    maze, entry, exit_pt, solution = load_hex_maze(target)
+    assert (maze.width, maze.height) == (31, 12)
+    assert (entry, exit_pt, solution) == ((0, 0), (30, 11), [])
+
+
+@pytest.mark.parametrize(
+    "text",
+    [
+        "9A\n3\n\n0,0\n1,1\n\n",     # rows of different widths
+        "9A\n3G\n\n0,0\n1,1\n\n",    # bad hex digit
+        "9A\nC6\n\n0;0\n1,1\n\n",    # bad entry line
+        "9A\nC6\n\n0,0\n",           # missing exit line
+        "9A\nC6\n\n0,0\n1,1\nEX\n",  # bad direction letter
+    ],
+)
+def test_malformed_files(tmp_path: Path, text: str) -> None:
+    """Malformed files raise RuntimeError, not a lower-level error."""
+    target = tmp_path / "bad.txt"
+    target.write_text(text)
+    with pytest.raises(RuntimeError):
+        load_hex_maze(str(target))
+
+
+def test_bad_digit_in_streamed_rows(tmp_path: Path) -> None:
+    """``iter_hex_rows`` rejects a bad digit when it reaches the row."""
+    target = tmp_path / "bad.txt"
+    target.write_text("9A\nZ6\n\n0,0\n1,1\n\n")
+    rows = iter_hex_rows(str(target))
+    assert next(rows) == bytes([9, 10])
+    with pytest.raises(RuntimeError):
+        next(rows)
+
+
+def test_missing_file(tmp_path: Path) -> None:
+    """A missing file raises RuntimeError."""
+    with pytest.raises(RuntimeError):
+        load_hex_maze(str(tmp_path / "missing.txt"))
+    with pytest.raises(RuntimeError):
+        list(iter_hex_rows(str(tmp_path / "missing.txt")))
@@ -0,0 +1,38 @@
+"""Tests for the whole-grid wall checks of the maze backends."""
+
+from typing import Type
+
+import pytest
+
+from mazegen import CompactMaze, Maze, MazeGenerator
+from mazegen.cell import BOTTOM, LEFT, RIGHT, TOP
+
+
+@pytest.mark.parametrize("maze_class", [Maze, CompactMaze])
+def test_inconsistent_walls(maze_class: Type[Maze]) -> None:
+    """One-sided walls are reported in row-major order."""
+    maze = maze_class(7, 5)
+    MazeGenerator(maze, seed=2).generate_perfect((0, 0))
+    assert maze.inconsistent_walls() == []
+
+    maze.cell(6, 4).walls &= ~LEFT
+    maze.cell(5, 4).walls |= RIGHT
+    maze.cell(2, 3).walls ^= TOP
+    maze.cell(0, 0).walls ^= RIGHT
+    assert maze.inconsistent_walls() == [
+        (0, 0, RIGHT),
+        (2, 2, BOTTOM),
+        (5, 4, RIGHT),
+    ]
+
+
+def test_numpy_matches_python() -> None:
+    """NumpyMaze reports the same walls as the pure-Python check."""
+    numpy_maze = pytest.importorskip("mazegen.numpy_maze")
+    maze = CompactMaze(9, 6)
+    MazeGenerator(maze, seed=4).generate_perfect((0, 0))
+    for x, y, wall in ((3, 2, RIGHT), (8, 5, TOP), (0, 1, BOTTOM)):
+        maze.cell(x, y).walls ^= wall
+    fast = numpy_maze.NumpyMaze.from_maze(maze)
+    assert fast.inconsistent_walls() == maze.inconsistent_walls()
+    assert len(maze.inconsistent_walls()) == 3
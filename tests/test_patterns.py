@@ -0,0 +1,79 @@
+"""Tests for glyph placement and stamping in ``patterns``."""
+
+from typing import Optional, Tuple
+
+import pytest
+
+from maze import CompactMaze, Maze
+from patterns import (
+    FORTY_TWO,
+    apply_42_pattern,
+    apply_pattern,
+    auto_scale,
+    compile_glyph,
+    to_glyph,
+)
+
+RING = ("###", "#.#", "###")
+
+
+@pytest.mark.parametrize("scale", [None, 1, 2])
+def test_splitting_glyph_is_rejected(scale: Optional[int]) -> None:
+    """A glyph enclosing free cells raises instead of being stamped."""
+    maze = CompactMaze(30, 30)
+    before = maze.wall_bytes()
+    with pytest.raises(RuntimeError, match="split"):
+        apply_pattern(maze, (0, 0), (29, 29), RING, scale)
+    assert maze.wall_bytes() == before
+
+
+def test_entry_under_glyph_falls_back_to_smaller_scale() -> None:
+    """ENTRY covered at the auto scale picks the next scale that fits."""
+    width, height = 63, 45
+    glyph = to_glyph(FORTY_TWO)
+    scale = auto_scale(glyph, width, height)
+    assert scale == 3
+    large = compile_glyph(glyph, width, height, scale)
+    small = compile_glyph(glyph, width, height, scale - 1)
+    assert large is not None and small is not None
+    entry = next(
+        (x, y)
+        for y in range(height)
+        for x in range(width)
+        if large.covers((x, y)) and not small.covers((x, y))
+    )
+    exit_pt = (width - 1, height - 1)
+
+    with pytest.raises(RuntimeError, match="ENTRY"):
+        apply_pattern(Maze(width, height), entry, exit_pt, FORTY_TWO, 3)
+
+    maze = Maze(width, height)
+    assert apply_pattern(maze, entry, exit_pt, FORTY_TWO) == scale - 1
+    assert not maze.cell(*entry).marked
+    assert sum(
+        maze.cell(x, y).marked
+        for y in range(height)
+        for x in range(width)
+    ) == sum(small.cells)
+
+
+@pytest.mark.parametrize(
+    "size", [(9, 7), (10, 8), (21, 15), (40, 23), (63, 45), (100, 31)]
+)
+def test_maze_and_compact_maze_stamp_alike(size: Tuple[int, int]) -> None:
+    """Both backends end up with the same walls and flags."""
+    width, height = size
+    mazes = [Maze(width, height), CompactMaze(width, height)]
+    for maze in mazes:
+        for y in range(height):
+            for x in range(width):
+                maze.cell(x, y).walls = 0
+        apply_42_pattern(maze, (0, 0), (width - 1, height - 1))
+    plain, compact = mazes
+    cells = [(x, y) for y in range(height) for x in range(width)]
+    for x, y in cells:
+        a, b = plain.cell(x, y), compact.cell(x, y)
+        assert (a.walls, a.visited, a.marked) == (
+            b.walls, b.visited, b.marked
+        ), (x, y)
+    assert any(compact.cell(x, y).marked for x, y in cells)
@@ -0,0 +1,58 @@
+"""Round-trip tests between ``write_packed_maze`` and ``PackedMazeFile``."""
+
+from pathlib import Path
+from typing import Tuple
+
+import pytest
+
+from generator import MazeGenerator
+from maze import Maze
+from reader import PackedMazeFile
+from solver import shortest_path
+from writer import write_packed_maze
+
+LETTERS = {(0, -1): "N", (1, 0): "E", (0, 1): "S", (-1, 0): "W"}
+
+
+@pytest.mark.parametrize(
+    "size", [(1, 1), (1, 4), (7, 5), (13, 11), (10, 3), (31, 2)]
+)
+@pytest.mark.parametrize("perfect", [False, True])
+@pytest.mark.parametrize("with_solution", [False, True])
+def test_write_then_read(
+    tmp_path: Path,
+    size: Tuple[int, int],
+    perfect: bool,
+    with_solution: bool,
+) -> None:
+    """Header fields, every cell and the solution survive a round trip."""
+    width, height = size
+    maze = Maze(width, height)
+    generator = MazeGenerator(maze, seed=width * height)
+    if perfect:
+        generator.generate_perfect((0, 0))
+    else:
+        generator.generate_imperfect((0, 0))
+    entry, exit_pt = (0, 0), (width - 1, height - 1)
+    path = shortest_path(maze, entry, exit_pt)
+    solution = path if with_solution else None
+    target = str(tmp_path / "maze.bin")
+    write_packed_maze(maze, target, entry, exit_pt, solution, perfect)
+
+    with PackedMazeFile(target) as packed:
+        assert (packed.width, packed.height) == size
+        assert (packed.entry, packed.exit) == (entry, exit_pt)
+        assert packed.perfect == perfect
+        assert packed.has_solution == with_solution
+        for y in range(height):
+            expected = bytes(maze.cell(x, y).walls for x in range(width))
+            assert packed.row(y) == expected
+            assert bytes(
+                packed.walls(x, y) for x in range(width)
+            ) == expected
+        letters = "".join(
+            LETTERS[(bx - ax, by - ay)]
+            for (ax, ay), (bx, by) in zip(path, path[1:])
+        )
+        assert packed.directions() == (letters if with_solution else "")
+        assert packed.steps == len(packed.directions())
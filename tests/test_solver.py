@@ -0,0 +1,103 @@
+"""Tests comparing the fast solvers against the reference BFS."""
+
+import random
+from typing import List, Tuple
+
+import pytest
+
+from mazegen import Maze, MazeGenerator
+from mazegen.cell import BOTTOM, LEFT, RIGHT, TOP
+from mazegen.junctions import JunctionGraph
+from mazegen.solver import shortest_path
+
+Point = Tuple[int, int]
+
+STEPS = {(0, -1): TOP, (1, 0): RIGHT, (0, 1): BOTTOM, (-1, 0): LEFT}
+
+
+def _build(perfect: bool, split: bool, seed: int) -> Maze:
+    """Generate a 21x15 maze, looped unless perfect, maybe split."""
+    maze = Maze(21, 15)
+    MazeGenerator(maze, seed=seed).generate_perfect((0, 0))
+    if not perfect:
+        rng = random.Random(seed)
+        for _ in range(60):
+            x, y = rng.randrange(20), rng.randrange(14)
+            maze.cell(x, y).walls &= ~(RIGHT | BOTTOM)
+            maze.cell(x + 1, y).walls &= ~LEFT
+            maze.cell(x, y + 1).walls &= ~TOP
+    if split:
+        for y in range(maze.height):
+            maze.cell(9, y).walls |= RIGHT
+            maze.cell(10, y).walls |= LEFT
+    return maze
+
+
+def _corridors(maze: Maze) -> List[Point]:
+    """List the cells with exactly two open sides."""
+    return [
+        (x, y)
+        for y in range(maze.height)
+        for x in range(maze.width)
+        if bin(maze.cell(x, y).walls & 0xF).count("1") == 2
+    ]
+
+
+def _assert_walkable(
+    maze: Maze, path: List[Point], start: Point, end: Point
+) -> None:
+    """Check the path runs from start to end through open walls."""
+    assert path[0] == start and path[-1] == end
+    for (x, y), (nx, ny) in zip(path, path[1:]):
+        wall = STEPS[(nx - x, ny - y)]
+        assert not maze.cell(x, y).walls & wall
+
+
+def _queries(maze: Maze, seed: int) -> List[Tuple[Point, Point]]:
+    """Pick random, corridor-to-corridor and degenerate queries."""
+    rng = random.Random(seed)
+    cells = [(x, y) for y in range(maze.height) for x in range(maze.width)]
+    corridors = _corridors(maze)
+    pairs = [(rng.choice(cells), rng.choice(cells)) for _ in range(40)]
+    pairs += [
+        (rng.choice(corridors), rng.choice(corridors)) for _ in range(40)
+    ]
+    pairs += [((0, 0), (0, 0)), ((0, 0), (20, 14))]
+    if len(corridors) > 1:
+        pairs.append((corridors[0], corridors[1]))
+    return pairs
+
+
+@pytest.mark.parametrize("perfect", [True, False])
+@pytest.mark.parametrize("split", [False, True])
+@pytest.mark.parametrize("seed", [0, 1, 2])
+def test_solvers_match_bfs(perfect: bool, split: bool, seed: int) -> None:
+    """Every solver finds a path exactly as short as BFS does."""
+    maze = _build(perfect, split, seed)
+    graph = JunctionGraph(maze)
+    assert graph.forest == perfect
+    for start, end in _queries(maze, seed):
+        expected = shortest_path(maze, start, end)
+        found = {
+            "bidirectional": shortest_path(
+                maze, start, end, "bidirectional"
+            ),
+            "astar": shortest_path(maze, start, end, "astar"),
+            "junctions": graph.path(start, end),
+        }
+        for method, path in found.items():
+            assert len(path) == len(expected), (method, start, end)
+            if path:
+                _assert_walkable(maze, path, start, end)
+
+
+@pytest.mark.parametrize("perfect", [True, False])
+def test_disconnected_endpoints(perfect: bool) -> None:
+    """Cells on opposite sides of a sealed wall have no path."""
+    maze = _build(perfect, True, 3)
+    graph = JunctionGraph(maze)
+    for start, end in (((0, 0), (20, 14)), ((9, 7), (10, 7))):
+        assert shortest_path(maze, start, end) == []
+        assert shortest_path(maze, start, end, "bidirectional") == []
+        assert shortest_path(maze, start, end, "astar") == []
+        assert graph.path(start, end) == []
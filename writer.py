@@ -1,7 +1,13 @@
-"""Write the maze to a hex-encoded output file."""
+"""Write the maze to a hex-encoded or packed binary output file."""
 
-from typing import List, Tuple
+import os
+import struct
+import threading
+from contextlib import contextmanager
+from operator import itemgetter, sub
+from typing import BinaryIO, Iterable, Iterator, List, Optional, Tuple
 
+import profiling
 from maze import Maze
 
 Point = Tuple[int, int]
@@ -12,6 +18,9 @@ _DIRECTION_LETTER = {
     (0, 1): "S",
     (-1, 0): "W",
 }
+_HEX_TABLE = bytes(b"0123456789ABCDEF"[b & 0xF] for b in range(256))
+_BUFFER_SIZE = 1 << 20
+_TEMP_ATTEMPTS = 100
 
 
 def _path_to_directions(
@@ -19,18 +28,111 @@ def _path_to_directions(
 ) -> str:
     """Convert a list of points to NESW direction string.
 
+    The step deltas are built with ``map`` over whole columns, so the
+    per-step work stays in C.
+
     Args:
         path: Ordered list of (x, y) coordinates.
 
     Returns:
         A string of N, E, S, W characters.
+
+    Raises:
+        RuntimeError: If two consecutive points are not adjacent.
+    """
+    x, y = itemgetter(0), itemgetter(1)
+    steps = zip(
+        map(sub, map(x, path[1:]), map(x, path)),
+        map(sub, map(y, path[1:]), map(y, path)),
+    )
+    try:
+        return "".join(map(_DIRECTION_LETTER.__getitem__, steps))
+    except KeyError as exc:
+        raise RuntimeError(
+            f"Solution path has a non-adjacent step {exc}"
+        ) from exc
+
+
+def _create_temp(path: str) -> Tuple[int, str]:
+    """Create a new, uniquely named file next to *path*.
+
+    Unlike ``tempfile.mkstemp`` the file is created with mode 0666
+    minus the process umask, like any file opened for writing, so the
+    renamed output gets the usual permissions.
+
+    Args:
+        path: Final output file path.
+
+    Returns:
+        The open file descriptor and the temporary file path.
+
+    Raises:
+        RuntimeError: If the file cannot be created.
+    """
+    directory, name = os.path.split(os.path.abspath(path))
+    flags = os.O_CREAT | os.O_EXCL | os.O_WRONLY | getattr(os, "O_BINARY", 0)
+    for _ in range(_TEMP_ATTEMPTS):
+        tmp = os.path.join(directory, f".{name}.{os.urandom(6).hex()}")
+        try:
+            return os.open(tmp, flags, 0o666), tmp
+        except FileExistsError:
+            continue
+        except OSError as exc:
+            raise RuntimeError(f"Cannot write maze file: {exc}") from exc
+    raise RuntimeError(f"Cannot write maze file: no free name for {path}")
+
+
+@contextmanager
+def _atomic_open(path: str) -> Iterator[BinaryIO]:
+    """Open a temporary file that replaces *path* on success.
+
+    The file is created next to *path* and renamed over it only once
+    everything has been written, so readers never see a partial
+    maze.  On error the temporary file is removed and *path* is left
+    untouched.
+
+    Args:
+        path: Final output file path.
+
+    Yields:
+        The temporary file, opened for binary writing.
+
+    Raises:
+        RuntimeError: If the file cannot be written.
+    """
+    fd, tmp = _create_temp(path)
+    try:
+        with os.fdopen(fd, "wb") as f:
+            yield f
+        os.replace(tmp, path)
+    except BaseException as exc:
+        try:
+            os.unlink(tmp)
+        except OSError:
+            pass
+        if isinstance(exc, OSError):
+            raise RuntimeError(f"Cannot write maze file: {exc}") from exc
+        raise
+
+
+def _trailer(
+    entry: Point, exit_pt: Point, solution: Optional[List[Point]]
+) -> bytes:
+    """Encode the lines that follow the grid.
+
+    Args:
+        entry: Entry cell coordinates.
+        exit_pt: Exit cell coordinates.
+        solution: Shortest path as a list of points, if any.
+
+    Returns:
+        The empty separator line, entry, exit and solution lines.
     """
-    parts: List[str] = []
-    for i in range(len(path) - 1):
-        dx = path[i + 1][0] - path[i][0]
-        dy = path[i + 1][1] - path[i][1]
-        parts.append(_DIRECTION_LETTER[(dx, dy)])
-    return "".join(parts)
+    return (
+        f"\n{entry[0]},{entry[1]}\n"
+        f"{exit_pt[0]},{exit_pt[1]}\n"
+        f"{_path_to_directions(solution or [])}\n"
+    ).encode("ascii")
 
 
 def write_hex_maze(
@@ -42,6 +144,10 @@ def write_hex_maze(
 ) -> None:
     """Write maze to file in hexadecimal wall format.
 
+    Rows are encoded a block at a time through a 256-entry lookup
+    table into one reusable buffer of about 1 MB, which is written
+    with a single call; the file is replaced atomically.
+
     Args:
         maze: The Maze to serialise.
         path: Output file path.
@@ -52,24 +158,250 @@ def write_hex_maze(
     Raises:
         RuntimeError: If the file cannot be written.
     """
-    try:
-        with open(path, "w", encoding="utf-8") as f:
-            for row in maze.grid:
-                line = "".join(
-                    f"{cell.walls:X}" for cell in row
-                )
-                f.write(line + "\n")
-            f.write("\n")
-            f.write(
-                f"{entry[0]},{entry[1]}\n"
+    width, height = maze.width, maze.height
+    walls = maze.wall_bytes()
+    line = width + 1
+    block = max(1, _BUFFER_SIZE // line)
+    buffer = bytearray(b"\n" * (block * line))
+    view = memoryview(buffer)
+    written = 0
+    with profiling.span("write"), _atomic_open(path) as f:
+        for top in range(0, height, block):
+            rows = min(block, height - top)
+            digits = walls[top * width:(top + rows) * width].translate(
+                _HEX_TABLE
             )
-            f.write(
-                f"{exit_pt[0]},{exit_pt[1]}\n"
-            )
-            f.write(
-                _path_to_directions(solution) + "\n"
-            )
-    except OSError as exc:
-        raise RuntimeError(
-            f"Cannot write maze file: {exc}"
-        ) from exc
+            for r in range(rows):
+                buffer[r * line:r * line + width] = digits[
+                    r * width:(r + 1) * width
+                ]
+            written += f.write(view[:rows * line])
+        written += f.write(_trailer(entry, exit_pt, solution))
+    profiling.count("write.bytes", written)
+
+
+def write_hex_rows(
+    rows: Iterable[bytes],
+    path: str,
+    entry: Point,
+    exit_pt: Point,
+    solution: Optional[List[Point]] = None,
+) -> None:
+    """Stream wall-mask rows to file in hexadecimal wall format.
+
+    Each row is encoded and written as soon as it is produced, so
+    only one row is held in memory (see ``eller.eller_rows``); the
+    file is replaced atomically once complete.
+
+    Args:
+        rows: Iterable of rows, one wall bitmask byte per cell.
+        path: Output file path.
+        entry: Entry cell coordinates.
+        exit_pt: Exit cell coordinates.
+        solution: Optional shortest path; an empty path line is
+            written when it is omitted.
+
+    Raises:
+        RuntimeError: If the file cannot be written.
+    """
+    written = 0
+    with profiling.span("write"), _atomic_open(path) as f:
+        for row in rows:
+            written += f.write(row.translate(_HEX_TABLE) + b"\n")
+        written += f.write(_trailer(entry, exit_pt, solution))
+    profiling.count("write.bytes", written)
+
+
+# Packed binary format, little-endian:
+#   header   magic, width, height, entry x/y, exit x/y, flags (u32),
+#            solution length in steps (u64)
+#   cells    two cells per byte, row-major; even cell in the low nibble
+#   solution four steps per byte, 2 bits each (N=0, E=1, S=2, W=3),
+#            first step in the low bits
+PACKED_MAGIC = b"AMZ1"
+PACKED_HEADER = struct.Struct("<4s7IQ")
+FLAG_SOLUTION = 1
+FLAG_PERFECT = 2
+
+_CHUNK = 1 << 20
+_LOW_NIBBLE = bytes(b & 0xF for b in range(256))
+_HIGH_NIBBLE = bytes((b & 0xF) << 4 for b in range(256))
+_STEP_CODE = bytes.maketrans(b"NESW", b"\x00\x01\x02\x03")
+_STEP_SHIFT = [bytes((b & 3) << s for b in range(256)) for s in (0, 2, 4, 6)]
+
+
+def pack_cells(walls: bytes) -> bytes:
+    """Pack one wall mask per byte into two cells per byte.
+
+    Whole chunks are merged as big integers, so no Python loop runs
+    per cell.
+
+    Args:
+        walls: One cell per byte; only the low four bits are used.
+
+    Returns:
+        ``(len(walls) + 1) // 2`` bytes.
+    """
+    out = bytearray()
+    for start in range(0, len(walls), _CHUNK):
+        even = walls[start:start + _CHUNK:2].translate(_LOW_NIBBLE)
+        odd = walls[start + 1:start + _CHUNK:2].translate(_HIGH_NIBBLE)
+        merged = int.from_bytes(even, "little") | int.from_bytes(
+            odd, "little"
+        )
+        out += merged.to_bytes(len(even), "little")
+    return bytes(out)
+
+
+def pack_directions(directions: str) -> bytes:
+    """Pack an NESW string into 2-bit step codes, four per byte.
+
+    Args:
+        directions: Solution as N, E, S, W characters.
+
+    Returns:
+        ``(len(directions) + 3) // 4`` bytes.
+    """
+    codes = directions.encode("ascii").translate(_STEP_CODE)
+    merged = 0
+    for lane, table in enumerate(_STEP_SHIFT):
+        merged |= int.from_bytes(codes[lane::4].translate(table), "little")
+    return merged.to_bytes((len(codes) + 3) // 4, "little")
+
+
+def write_packed_maze(
+    maze: Maze,
+    path: str,
+    entry: Point,
+    exit_pt: Point,
+    solution: Optional[List[Point]] = None,
+    perfect: bool = False,
+) -> None:
+    """Write maze to file in the packed binary format.
+
+    Read it back with ``reader.PackedMazeFile``.
+
+    Args:
+        maze: The Maze to serialise.
+        path: Output file path.
+        entry: Entry cell coordinates.
+        exit_pt: Exit cell coordinates.
+        solution: Optional shortest path as a list of points.
+        perfect: Whether the maze is perfect (stored as a flag).
+
+    Raises:
+        RuntimeError: If the file cannot be written.
+    """
+    directions = _path_to_directions(solution or [])
+    flags = (FLAG_SOLUTION if solution else 0) | (
+        FLAG_PERFECT if perfect else 0
+    )
+    header = PACKED_HEADER.pack(
+        PACKED_MAGIC,
+        maze.width,
+        maze.height,
+        entry[0],
+        entry[1],
+        exit_pt[0],
+        exit_pt[1],
+        flags,
+        len(directions),
+    )
+    with _atomic_open(path) as f:
+        f.write(header)
+        f.write(pack_cells(maze.wall_bytes()))
+        f.write(pack_directions(directions))
+
+
+class BackgroundWriter:
+    """Persist mazes with ``write_hex_maze`` on a background thread.
+
+    ``submit`` returns at once.  Submissions made while a write is in
+    progress are coalesced: only the latest one is written next, so
+    rapid regenerations never queue up behind a slow disk.  Errors
+    are kept for the caller to report with ``error``.
+    """
+
+    def __init__(self, path: str) -> None:
+        """Start the writer thread.
+
+        Args:
+            path: Output file path.
+        """
+        self.path = path
+        self._cond = threading.Condition()
+        self._pending: Optional[
+            Tuple[Maze, Point, Point, List[Point]]
+        ] = None
+        self._busy = False
+        self._closed = False
+        self._error: Optional[str] = None
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def submit(
+        self,
+        maze: Maze,
+        entry: Point,
+        exit_pt: Point,
+        solution: List[Point],
+    ) -> None:
+        """Schedule *maze* to be written, replacing any pending maze.
+
+        Args:
+            maze: The Maze to serialise; it must not change afterwards.
+            entry: Entry cell coordinates.
+            exit_pt: Exit cell coordinates.
+            solution: Shortest path as a list of points.
+        """
+        with self._cond:
+            self._pending = (maze, entry, exit_pt, solution)
+            self._cond.notify_all()
+
+    def error(self) -> Optional[str]:
+        """Return and clear the last write error.
+
+        Returns:
+            The error message, or None if every write succeeded.
+        """
+        with self._cond:
+            error, self._error = self._error, None
+        return error
+
+    def flush(self) -> None:
+        """Wait until the latest submitted maze has been written."""
+        with self._cond:
+            while self._pending is not None or self._busy:
+                self._cond.wait()
+
+    def close(self) -> None:
+        """Write any pending maze, then stop the thread."""
+        self.flush()
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        self._thread.join()
+
+    def _run(self) -> None:
+        """Thread body: write the latest submission until closed."""
+        while True:
+            with self._cond:
+                while self._pending is None and not self._closed:
+                    self._cond.wait()
+                if self._pending is None:
+                    return
+                job, self._pending = self._pending, None
+                self._busy = True
+            error: Optional[str] = None
+            try:
+                write_hex_maze(job[0], self.path, *job[1:])
+            except RuntimeError as exc:
+                error = str(exc)
+            except Exception as exc:
+                error = f"Unexpected error writing maze file: {exc!r}"
+            finally:
+                with self._cond:
+                    self._busy = False
+                    if error is not None:
+                        self._error = error
+                    self._cond.notify_all()